@@ -0,0 +1,30 @@
+"""Helpers for reading input files."""
+
+import mmap
+import os
+from collections.abc import Iterator
+
+
+def iter_lines(filename: str) -> Iterator[bytes]:
+    """Iterate over the lines of a file, as bytes.
+
+    Like iterating over a file opened in binary mode (lines keep their
+    trailing newline), but the file is memory-mapped, so reading it doesn't
+    go through Python's file buffering.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Can't mmap an empty file
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b"")
+
+
+def read_lines(filename: str) -> list[str]:
+    """Read all the lines of a UTF-8 file, like readlines().
+
+    The whole file is read in one binary read and decoded once, rather than
+    decoded and split line by line through a text-mode buffer.
+    """
+    with open(filename, "rb") as f:
+        return f.read().decode("utf-8").splitlines(keepends=True)
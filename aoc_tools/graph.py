@@ -7,7 +7,7 @@ import math
 from dataclasses import dataclass
 from enum import Enum
 from functools import cached_property
-from typing import Iterable
+from typing import Iterable, NamedTuple, Sequence
 
 import numpy
 
@@ -24,19 +24,26 @@ class Dir(Enum):
 
     def reverse(self) -> Dir:
         """Reverse this direction."""
-        if self == Dir.LEFT:
-            return Dir.RIGHT
-        if self == Dir.RIGHT:
-            return Dir.LEFT
-        if self == Dir.UP:
-            return Dir.DOWN
-        if self == Dir.DOWN:
-            return Dir.UP
-        raise RuntimeError("you forgot a case")
-
-
-@dataclass(frozen=True)
-class Point:
+        return _REVERSE_DIR[self]
+
+
+_REVERSE_DIR = {
+    Dir.LEFT: Dir.RIGHT,
+    Dir.RIGHT: Dir.LEFT,
+    Dir.UP: Dir.DOWN,
+    Dir.DOWN: Dir.UP,
+}
+
+# (row, col) offset for one step in each direction
+_DIR_DELTA = {
+    Dir.LEFT: (0, -1),
+    Dir.RIGHT: (0, 1),
+    Dir.UP: (-1, 0),
+    Dir.DOWN: (1, 0),
+}
+
+
+class Point(NamedTuple):
     """One point in 2D space.
 
     By default, this uses row and column;
@@ -63,15 +70,10 @@ class Point:
 
     def go(self, direction: Dir, n: int = 1) -> Point:
         """From this point, go in a direction."""
-        if direction == Dir.LEFT:
-            return Point(self.row, self.col - n)
-        if direction == Dir.RIGHT:
-            return Point(self.row, self.col + n)
-        if direction == Dir.UP:
-            return Point(self.row - n, self.col)
-        if direction == Dir.DOWN:
-            return Point(self.row + n, self.col)
-        raise ValueError(f"Unrecognized direction {direction}")
+        if direction not in _DIR_DELTA:
+            raise ValueError(f"Unrecognized direction {direction}")
+        d_row, d_col = _DIR_DELTA[direction]
+        return Point(self.row + d_row * n, self.col + d_col * n)
 
     def valid(self, max_row: int, max_col: int) -> bool:
         """Is this point valid for a graph with the given max_row+max_col?"""
@@ -93,17 +95,30 @@ class Point:
         """Distance between two points."""
         return Edge(self, other).distance()
 
-    def neighbors(self) -> list[Point]:
+    def distance_sq(self, other: Point) -> int:
+        """Squared distance between two points.
+
+        Cheaper than ``distance`` if you only need to compare distances.
+        """
+        return Edge(self, other).distance_sq()
+
+    def neighbors(self) -> tuple[Point, Point, Point, Point]:
         """Return all of this point's neighbors (up/down/left/right)."""
-        return [
-            Point(self.row - 1, self.col),
-            Point(self.row + 1, self.col),
-            Point(self.row, self.col - 1),
-            Point(self.row, self.col + 1),
-        ]
+        row, col = self
+        return (
+            Point(row - 1, col),
+            Point(row + 1, col),
+            Point(row, col - 1),
+            Point(row, col + 1),
+        )
+
+    def neighbor_coords(self) -> tuple[tuple[int, int], ...]:
+        """Like ``neighbors``, but as plain (row, col) tuples."""
+        row, col = self
+        return ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Edge:
     """An edge, connecting two points."""
 
@@ -119,9 +134,16 @@ class Edge:
 
     def distance(self) -> float:
         """Length of this edge."""
+        return math.sqrt(self.distance_sq())
+
+    def distance_sq(self) -> int:
+        """Squared length of this edge.
+
+        Cheaper than ``distance`` if you only need to compare lengths.
+        """
         row_diff_squared = (self.p1.row - self.p2.row) ** 2
         col_diff_squared = (self.p1.col - self.p2.col) ** 2
-        return math.sqrt(row_diff_squared + col_diff_squared)
+        return row_diff_squared + col_diff_squared
 
     def integer_points(self) -> int:
         """How many integer points are along this edge?
@@ -134,12 +156,10 @@ class Edge:
 
     def collinear_with(self, point: Point) -> bool:
         """Is this point collinear with this edge?"""
-        matrix = [
-            [self.p1.row, self.p1.col],
-            [self.p2.row, self.p2.col],
-            [point.row, point.col],
-        ]
-        return numpy.linalg.matrix_rank(matrix) <= 1
+        # The cross product of (p2 - p1) and (point - p1) is 0 iff they're collinear
+        return (self.p2.row - self.p1.row) * (point.col - self.p1.col) == (
+            self.p2.col - self.p1.col
+        ) * (point.row - self.p1.row)
 
     def intersects(self, other: Edge, infinite: bool = True) -> bool:
         """Does this edge intersect with the other one?
@@ -155,6 +175,11 @@ class Edge:
         if infinite:
             # If it's 0, the lines are parallel
             return denom != 0
+        if not self.intersects_bbox(other):
+            return False
+        if denom == 0:
+            # Parallel segments only touch if they're on the same line
+            return self.collinear_with(other.p1) and self.collinear_with(other.p2)
         row, col = self.intersection_point(other)
         return all((
             between(row, (self.p1.row, self.p2.row)),
@@ -163,72 +188,131 @@ class Edge:
             between(col, (other.p1.col, other.p2.col)),
         ))
 
+    def intersects_bbox(self, other: Edge) -> bool:
+        """Do the bounding boxes of this edge and the other one overlap?
+
+        If they don't, the edges (as segments) can't intersect.
+        """
+        return (
+            max(self.p1.row, self.p2.row) >= min(other.p1.row, other.p2.row)
+            and max(other.p1.row, other.p2.row) >= min(self.p1.row, self.p2.row)
+            and max(self.p1.col, self.p2.col) >= min(other.p1.col, other.p2.col)
+            and max(other.p1.col, other.p2.col) >= min(self.p1.col, self.p2.col)
+        )
+
     def intersection_point(self, other: Edge) -> tuple[float, float]:
         """Return the point where these two lines intersect.
 
         This is returned as row,col coords - flip them around for x,y.
         """
-        denom = (self.p1.x - self.p2.x) * (other.p1.y - other.p2.y) - (
-            self.p1.y - self.p2.y
-        ) * (other.p1.x - other.p2.x)
-        x_num = (
-            (self.p1.x * self.p2.y - self.p1.y * self.p2.x) * (other.p1.x - other.p2.x)
-        ) - (
-            (self.p1.x - self.p2.x)
-            * (other.p1.x * other.p2.y - other.p1.y * other.p2.x)
-        )
-        y_num = (
-            (self.p1.x * self.p2.y - self.p1.y * self.p2.x) * (other.p1.y - other.p2.y)
-        ) - (
-            (self.p1.y - self.p2.y)
-            * (other.p1.x * other.p2.y - other.p1.y * other.p1.x)
-        )
+        x1, y1 = self.p1.x, self.p1.y
+        x2, y2 = self.p2.x, self.p2.y
+        x3, y3 = other.p1.x, other.p1.y
+        x4, y4 = other.p2.x, other.p2.y
+        det12 = x1 * y2 - y1 * x2
+        det34 = x3 * y4 - y3 * x4
+        denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+        x_num = det12 * (x3 - x4) - (x1 - x2) * det34
+        y_num = det12 * (y3 - y4) - (y1 - y2) * det34
         return y_num / denom, x_num / denom
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Polygon:
-    """A polygon, made up of N points (in some order)."""
+    """A polygon, made up of N points (in some order).
+
+    The points are stored as two int64 arrays, one of rows and one of cols;
+    use the ``from_points`` constructor to make one from Points.
+    """
 
-    points: tuple[Point, ...]
+    _rows: numpy.ndarray
+    _cols: numpy.ndarray
 
     @classmethod
     def from_points(cls, points: Iterable[Point]) -> Polygon:
         """Create a polygon from any iterable of points."""
         point_tuple = tuple(p for p in points)
-        return cls(point_tuple)
+        rows = numpy.fromiter(
+            (p.row for p in point_tuple), dtype=numpy.int64, count=len(point_tuple)
+        )
+        cols = numpy.fromiter(
+            (p.col for p in point_tuple), dtype=numpy.int64, count=len(point_tuple)
+        )
+        rows.flags.writeable = False
+        cols.flags.writeable = False
+        return cls(rows, cols)
+
+    def __eq__(self, other: object) -> bool:
+        """Two polygons are equal if they have the same points, in order."""
+        if not isinstance(other, Polygon):
+            return NotImplemented
+        return numpy.array_equal(self._rows, other._rows) and numpy.array_equal(
+            self._cols, other._cols
+        )
+
+    def __hash__(self) -> int:
+        """Hash the points, so equal polygons hash the same."""
+        return hash((self._rows.tobytes(), self._cols.tobytes()))
 
     @cached_property
-    def _point_list(self) -> list[Point]:
-        """Return points as a list."""
-        return list(self.points)
+    def points(self) -> tuple[Point, ...]:
+        """Return the points of this polygon, in order."""
+        return tuple(
+            Point(row, col)
+            for row, col in zip(self._rows.tolist(), self._cols.tolist())
+        )
 
     @cached_property
     def edges(self) -> tuple[Edge, ...]:
         """Return edges of this polygon."""
-        start_point = self.points[0]
-        start_to_start: list[Point] = self._point_list + [start_point]
+        start_to_start: list[Point] = list(self.points) + [self.points[0]]
         edges: tuple[Edge, ...] = tuple(
             Edge(p1, p2) for p1, p2 in itertools.pairwise(start_to_start)
         )
         return edges
 
+    def self_intersections(self) -> list[tuple[int, int]]:
+        """Find every pair of non-adjacent edges that intersect.
+
+        Returns pairs of indexes into ``edges``, smaller index first.
+        A simple polygon has none.
+        """
+        n = len(self.edges)
+        return [
+            (i, j)
+            for i, j in intersect_edges(self.edges, self.edges)
+            if i < j - 1 and not (i == 0 and j == n - 1)
+        ]
+
     @cached_property
-    def reversed(self) -> Polygon:
-        """Same points, in the opposite direction."""
-        reversed_points = list(reversed(self.points))
-        return Polygon.from_points(reversed_points)
+    def _boundary_points(self) -> int:
+        """How many integer points are on the edges of this polygon?"""
+        rows, cols = self._rows, self._cols
+        return int(
+            numpy.gcd(
+                numpy.abs(numpy.diff(rows, append=rows[0])),
+                numpy.abs(numpy.diff(cols, append=cols[0])),
+            ).sum()
+        )
+
+    def perimeter(self) -> float:
+        """Find the length of the perimeter of this polygon."""
+        rows, cols = self._rows, self._cols
+        return float(
+            numpy.hypot(
+                numpy.diff(rows, append=rows[0]), numpy.diff(cols, append=cols[0])
+            ).sum()
+        )
 
     def enclosed_area(self) -> float:
         """Find the enclosed area of this polygon."""
-        matrix_sum = sum(e.determinant() for e in self.edges)
-        # The original formula is only valid going in one direction,
-        # and produces a negative result in the other direction.
-        # We could determine which way is counterclockwise ...
-        # OR we could just calculate it twice lol
-        if matrix_sum < 0:
-            return self.reversed.enclosed_area()
-        return matrix_sum
+        rows, cols = self._rows, self._cols
+        matrix_sum = numpy.dot(cols, numpy.roll(rows, -1)) - numpy.dot(
+            rows, numpy.roll(cols, -1)
+        )
+        # The formula is negative if we go clockwise instead of counterclockwise,
+        # but the magnitude is the same either way.
+        return float(abs(matrix_sum)) / 2
 
     def count_enclosed_points(self) -> int:
         """Count the number of integer points enclosed by this polygon.
@@ -236,8 +320,38 @@ class Polygon:
         See: Pick's theorem.
         """
         area = self.enclosed_area()
-        boundary_points = sum(e.integer_points() for e in self.edges)
-        return int(area + 1 - (boundary_points / 2))
+        return int(area + 1 - (self._boundary_points / 2))
+
+
+def intersect_edges(
+    edges_a: Sequence[Edge], edges_b: Sequence[Edge]
+) -> list[tuple[int, int]]:
+    """Find every pair of edges, one from each list, that intersect.
+
+    Returns (index in edges_a, index in edges_b) pairs.
+
+    Sweeps left to right across the columns, so an edge only gets checked
+    against edges from the other list whose column ranges overlap its own.
+    """
+    # (min col, max col, which list, index)
+    spans = sorted(
+        (min(e.p1.col, e.p2.col), max(e.p1.col, e.p2.col), which, i)
+        for which, edges in enumerate((edges_a, edges_b))
+        for i, e in enumerate(edges)
+    )
+    active: tuple[list[tuple[int, int]], list[tuple[int, int]]] = ([], [])
+    out: list[tuple[int, int]] = []
+    for min_col, max_col, which, i in spans:
+        edge = (edges_a, edges_b)[which][i]
+        other_edges = (edges_a, edges_b)[1 - which]
+        # Drop anything that ended before this edge started
+        for j in (0, 1):
+            active[j][:] = [(end, k) for end, k in active[j] if end >= min_col]
+        for _, k in active[1 - which]:
+            if edge.intersects(other_edges[k], infinite=False):
+                out.append((i, k) if which == 0 else (k, i))
+        active[which].append((max_col, i))
+    return sorted(out)
 
 
 def get_edges(polygon: list[Point]) -> list[Edge]:
@@ -255,13 +369,9 @@ def enclosed_area(polygon: list[Point]) -> float:
     """Find the enclosed area of this polygon."""
     edges = get_edges(polygon)
     matrix_sum = sum(e.determinant() for e in edges)
-    # The original formula is only valid going in one direction,
-    # and produces a negative result in the other.
-    # We could determine which way is counterclockwise ...
-    # or we could just calculate it twice lol
-    if matrix_sum < 0:
-        return enclosed_area(list(reversed(polygon)))
-    return matrix_sum / 2
+    # The formula is negative if we go clockwise instead of counterclockwise,
+    # but the magnitude is the same either way.
+    return abs(matrix_sum) / 2
 
 
 def count_enclosed_points(polygon: list[Point]) -> int:
@@ -269,9 +379,12 @@ def count_enclosed_points(polygon: list[Point]) -> int:
 
     See: Pick's theorem.
     """
-    area = enclosed_area(polygon)
-    edges = get_edges(polygon)
-    boundary_points = sum(e.integer_points() for e in edges)
+    matrix_sum = 0
+    boundary_points = 0
+    for p1, p2 in itertools.pairwise(polygon + [polygon[0]]):
+        matrix_sum += (p1.col * p2.row) - (p1.row * p2.col)
+        boundary_points += math.gcd(abs(p1.row - p2.row), abs(p1.col - p2.col))
+    area = abs(matrix_sum) / 2
     return int(area + 1 - (boundary_points / 2))
 
 
@@ -18,7 +18,10 @@ _ListArg = Union[list[T], Iterable[T]]
 
 
 class HashList(MutableSequence[T]):
-    """A hashable list."""
+    """A hashable list.
+
+    Like any mutable hashable, don't mutate it while it's in a set or dict.
+    """
 
     _items: list[T]
 
@@ -31,7 +34,13 @@ class HashList(MutableSequence[T]):
 
     def __hash__(self) -> int:
         """Implement hash."""
-        return hash(e for e in self)
+        return hash(tuple(self._items))
+
+    def __eq__(self, other: object) -> bool:
+        """Two HashLists are equal if they have the same items."""
+        if not isinstance(other, HashList):
+            return NotImplemented
+        return self._items == other._items
 
     @overload
     def __getitem__(self, index: int) -> T:
@@ -85,7 +94,10 @@ _MapArg = Union[dict[K, V], Mapping[K, V], Iterable[tuple[K, V]]]
 
 
 class HashDict(MutableMapping[K, V]):
-    """A hashable dictionary."""
+    """A hashable dictionary.
+
+    Like any mutable hashable, don't mutate it while it's in a set or dict.
+    """
 
     _items: dict[K, V]
 
@@ -102,7 +114,7 @@ class HashDict(MutableMapping[K, V]):
             raise ValueError(f"items {items} has bad type {type(items)}")
 
     def __hash__(self) -> int:
-        return hash((k, v) for k, v in self._items.items())
+        return hash(frozenset(self._items.items()))
 
     def __getitem__(self, key: K) -> V:
         """Get item."""
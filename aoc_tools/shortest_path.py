@@ -2,15 +2,21 @@
 
 I haven't actually tested these yet. So they may not work right."""
 
+from __future__ import annotations
+
+import heapq
 import itertools
+import sys
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from collections.abc import Hashable
 from dataclasses import dataclass, field
 from typing import Any, Iterable, Optional
 
+import numpy
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Path:
     """Represents a path from some start node (not shown) to this node."""
 
@@ -79,25 +85,18 @@ class Graph(ABC):
 
         min_costs: defaultdict[Hashable, int] = defaultdict(lambda: INFINITY)
         min_costs[self.start_id] = 0
-
-        def find_next_node(
-            cost_by_id: defaultdict[Hashable, int]
-        ) -> tuple[Optional[Hashable], int]:
-            """Find the lowest-cost unvisited node. Return its ID and its cost."""
-            best_id: Optional[Hashable] = None
-            best_cost = INFINITY
-            for node_id, cost in cost_by_id.items():
-                if cost < best_cost:
-                    best_id = node_id
-                    best_cost = cost
-            return best_id, best_cost
-
-        cur_id, cur_cost = find_next_node(min_costs)
-        while cur_id != self.end_id and cur_id is not None:
-            if cur_cost < 0:
-                raise RuntimeError(
-                    "Dijkstra's algorithm does not work if some costs are negative"
-                )
+        # Node IDs aren't necessarily orderable, so break cost ties with a counter
+        tiebreak = itertools.count()
+        queue: list[tuple[int, int, Hashable]] = [(0, next(tiebreak), self.start_id)]
+        visited: set[Hashable] = set()
+
+        while queue:
+            cur_cost, _, cur_id = heapq.heappop(queue)
+            if cur_id in visited:
+                continue
+            if cur_id == self.end_id:
+                return cur_cost
+            visited.add(cur_id)
             cur_node = self.find_node(cur_id)
             assert cur_node is not None, f"missing node {cur_id}"
             for path in cur_node.paths:
@@ -105,85 +104,86 @@ class Graph(ABC):
                     raise RuntimeError(
                         "Dijkstra's algorithm does not work if some costs are negative"
                     )
-                min_costs[path.to_node_id] = min(
-                    min_costs[path.to_node_id], cur_cost + path.cost
-                )
-            cur_id, cur_cost = find_next_node(min_costs)
-        if cur_id is None:
-            return INFINITY
+                if path.to_node_id in visited:
+                    continue
+                new_cost = cur_cost + path.cost
+                if new_cost < min_costs[path.to_node_id]:
+                    min_costs[path.to_node_id] = new_cost
+                    heapq.heappush(queue, (new_cost, next(tiebreak), path.to_node_id))
 
-        return cur_cost
+        return INFINITY
 
     def floyd_warshall(self) -> dict[tuple[Hashable, Hashable], int]:
         """Run Floyd-Warshall algorithm and return all-pairs shortest paths."""
-        best_costs: defaultdict[tuple[Hashable, Hashable], int] = defaultdict(
-            lambda: INFINITY
-        )
-
-        def path_to_key(p: Path) -> tuple[Hashable, Hashable]:
-            """Get dict key from a path."""
-            return (p.from_node_id, p.to_node_id)
+        node_ids = list(self.node_ids())
+        index_of = {node_id: i for i, node_id in enumerate(node_ids)}
+        n = len(node_ids)
 
+        dist = numpy.full((n, n), _UNREACHABLE, dtype=numpy.int64)
+        numpy.fill_diagonal(dist, 0)
         for path in self.paths():
-            key = path_to_key(path)
-            best_costs[key] = path.cost
-
-        node_ids = self.node_ids()
-        for node_id in node_ids:
-            best_costs[(node_id, node_id)] = 0
-
-        for id_k in node_ids:
-            for id_i in node_ids:
-                for id_j in node_ids:
-                    ij_key = (id_i, id_j)
-                    ik_key = (id_i, id_k)
-                    kj_key = (id_k, id_j)
-                    best_costs[ij_key] = min(
-                        best_costs[ij_key], best_costs[ik_key] + best_costs[kj_key]
-                    )
+            i = index_of[path.from_node_id]
+            j = index_of[path.to_node_id]
+            dist[i, j] = min(dist[i, j], path.cost)
+
+        for k in range(n):
+            via_k = dist[:, k, None] + dist[None, k, :]
+            # Don't let a negative cost make an unreachable node look reachable
+            reachable = (dist[:, k, None] < _UNREACHABLE) & (
+                dist[None, k, :] < _UNREACHABLE
+            )
+            numpy.minimum(dist, numpy.where(reachable, via_k, _UNREACHABLE), out=dist)
 
-        for node_id in node_ids:
-            if best_costs[(node_id, node_id)] < 0:
-                raise RuntimeError(
-                    "This graph has a negative cycle so there's no best path"
-                )
+        if (numpy.diagonal(dist) < 0).any():
+            raise RuntimeError(
+                "This graph has a negative cycle so there's no best path"
+            )
 
-        return dict(best_costs)
+        pairs = ((a, b) for a in node_ids for b in node_ids)
+        return {
+            (a, b): INFINITY if cost >= _UNREACHABLE else cost
+            for (a, b), cost in zip(pairs, dist.ravel().tolist())
+        }
 
 
-INFINITY = 99999999999999999999999999999999999999999999999999999999
+INFINITY = sys.maxsize
+# Adding to INFINITY would overflow an int64, so numpy code uses this instead.
+# It's small enough that adding two of them together can't overflow.
+_UNREACHABLE = numpy.iinfo(numpy.int64).max // 4
 
 
 @dataclass
 class BasicGraph(Graph):
     """A graph. It has a bunch of nodes."""
 
-    nodes: list[Node] = field(default_factory=list)
+    _by_id: dict[Hashable, Node] = field(default_factory=dict)
     start_id: Optional[Hashable] = None
     end_id: Optional[Hashable] = None
 
+    @property
+    def nodes(self) -> list[Node]:
+        """Return every node in the graph."""
+        return list(self._by_id.values())
+
     def find_node(self, node_id: Hashable) -> Optional[Node]:
         """Find a node, by id."""
-        for node in self.nodes:
-            if node.identifier == node_id:
-                return node
-        return None
+        return self._by_id.get(node_id)
 
     def node_ids(self) -> Iterable[Hashable]:
         """Return IDs of every node in the graph."""
-        return list(n.identifier for n in self.nodes)
+        return self._by_id.keys()
 
     def paths(self) -> Iterable[Path]:
         """Return every path in the graph."""
-        unflat_paths = list(n.paths for n in self.nodes)
+        unflat_paths = list(n.paths for n in self._by_id.values())
         flat_paths = itertools.chain.from_iterable(unflat_paths)
         return flat_paths
 
     def add_node(self, node: Node) -> None:
         """Add a node."""
-        if self.find_node(node.identifier) is not None:
+        if node.identifier in self._by_id:
             raise RuntimeError(f"Node {node.identifier} is already in this graph")
-        self.nodes.append(node)
+        self._by_id[node.identifier] = node
 
     def neighbors(self, node_id: Hashable) -> Iterable[Path]:
         """Return all neighbors of this node."""
@@ -191,5 +191,76 @@ class BasicGraph(Graph):
         assert node is not None, f"can't find neighbors of nonexistent node {node_id}"
         return node.paths
 
+    def to_csr(self) -> CSRGraph:
+        """Pack this graph into a CSRGraph, for running lots of searches on it."""
+        node_ids = list(self._by_id)
+        index_of = {node_id: i for i, node_id in enumerate(node_ids)}
+        indptr = [0]
+        indices: list[int] = []
+        weights: list[int] = []
+        for node in self._by_id.values():
+            for path in node.paths:
+                if path.to_node_id not in index_of:
+                    raise RuntimeError(f"missing node {path.to_node_id}")
+                if path.cost < 0:
+                    raise RuntimeError(
+                        "Dijkstra's algorithm does not work if some costs are negative"
+                    )
+                indices.append(index_of[path.to_node_id])
+                weights.append(path.cost)
+            indptr.append(len(indices))
+        return CSRGraph(node_ids, indptr, indices, weights)
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """A graph packed into compressed sparse row form.
+
+    The paths out of node ``i`` are ``indices[indptr[i]:indptr[i+1]]``,
+    with costs ``weights[indptr[i]:indptr[i+1]]``.
+    Nodes are referred to by their position in ``node_ids``,
+    so searching doesn't need to touch any Node or Path objects.
+    """
+
+    node_ids: list[Hashable]
+    indptr: list[int]
+    indices: list[int]
+    weights: list[int]
+    # Position of each node in node_ids
+    index_of: dict[Hashable, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Index the node ids, so each search can look them up directly."""
+        index_of = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        object.__setattr__(self, "index_of", index_of)
+
+    def dijkstra(self, start_id: Hashable, end_id: Hashable) -> int:
+        """Return the cost of the shortest path from start_id to end_id."""
+        for node_id in (start_id, end_id):
+            if node_id not in self.index_of:
+                raise ValueError(f"{node_id} is not in this graph")
+        start = self.index_of[start_id]
+        end = self.index_of[end_id]
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+
+        min_costs = [INFINITY] * len(self.node_ids)
+        min_costs[start] = 0
+        visited = [False] * len(self.node_ids)
+        queue = [(0, start)]
+        while queue:
+            cur_cost, cur = heapq.heappop(queue)
+            if visited[cur]:
+                continue
+            if cur == end:
+                return cur_cost
+            visited[cur] = True
+            for i in range(indptr[cur], indptr[cur + 1]):
+                to = indices[i]
+                new_cost = cur_cost + weights[i]
+                if not visited[to] and new_cost < min_costs[to]:
+                    min_costs[to] = new_cost
+                    heapq.heappush(queue, (new_cost, to))
+        return INFINITY
+
 
 BasicGraph()
@@ -6,7 +6,7 @@ import math
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Point:
     """A point in 3D space."""
 
@@ -27,7 +27,14 @@ class Point:
 
     def distance(self, other: Point) -> float:
         """Distance between this point and another."""
+        return math.sqrt(self.distance_sq(other))
+
+    def distance_sq(self, other: Point) -> int:
+        """Squared distance between this point and another.
+
+        Cheaper than ``distance`` if you only need to compare distances.
+        """
         x_diff = (self.x - other.x) ** 2
         y_diff = (self.y - other.y) ** 2
         z_diff = (self.z - other.z) ** 2
-        return math.sqrt(x_diff + y_diff + z_diff)
+        return x_diff + y_diff + z_diff
@@ -1,29 +1,26 @@
 """Part 1 of Day 1 of 2023 Advent of Code."""
 import argparse
-import string
 
+from aoc_tools.files import iter_lines
 
-def get_calibration_value(s: str) -> int:
+# Every byte that isn't an ASCII digit, for deleting with bytes.translate
+_NOT_DIGITS = bytes(b for b in range(256) if b not in b"0123456789")
+
+
+def get_calibration_value(s: bytes) -> int:
     """Get the calibration value from a string.
 
     This is the first digit and the last digit in the string.
 
     Ex. a1b2c3d4e5f -> 15.
     """
-    digits = [char for char in s if char in string.digits]
-    first_digit = digits[0]
-    last_digit = digits[-1]
-    value_as_str = f"{first_digit}{last_digit}"
-    return int(value_as_str)
+    digits = s.translate(None, _NOT_DIGITS)
+    return (digits[0] - ord("0")) * 10 + (digits[-1] - ord("0"))
 
 
 def sum_all_calibration_values(filename: str) -> int:
     """Sum all calibration values in a file."""
-    the_sum = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            the_sum += get_calibration_value(line)
-    return the_sum
+    return sum(get_calibration_value(line) for line in iter_lines(filename))
 
 
 def main() -> None:
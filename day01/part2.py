@@ -1,61 +1,44 @@
 """Part 1 of Day 1 of 2023 Advent of Code."""
 import argparse
-import string
-from copy import copy
-
-
-def get_calibration_value(s: str) -> int:
+import re
+
+from aoc_tools.files import iter_lines
+
+digit_map: dict[bytes, int] = {
+    b"one": 1,
+    b"two": 2,
+    b"three": 3,
+    b"four": 4,
+    b"five": 5,
+    b"six": 6,
+    b"seven": 7,
+    b"eight": 8,
+    b"nine": 9,
+}
+digit_map.update({str(i).encode(): i for i in range(10)})
+
+_digit_re = re.compile(b"|".join(digit_map))
+# Searching the reversed string for reversed words finds the last digit,
+# even when it overlaps an earlier one, like the "eight" in "oneight"
+_reversed_digit_re = re.compile(b"|".join(k[::-1] for k in digit_map))
+
+
+def get_calibration_value(s: bytes) -> int:
     """Get the calibration value from a string.
 
     This is the first digit and the last digit in the string.
 
     Ex. a1b2c3d4e5f -> 15.
     """
-    digit_map: dict[str, int] = {
-        "one": 1,
-        "two": 2,
-        "three": 3,
-        "four": 4,
-        "five": 5,
-        "six": 6,
-        "seven": 7,
-        "eight": 8,
-        "nine": 9,
-    }
-    digit_map.update({str(i): int(i) for i in string.digits})
-    reversed_digit_map: dict[str, int] = {}
-    for key, val in digit_map.items():
-        copy_key = copy(key)[::-1]
-        reversed_digit_map[copy_key] = val
-    first_digit_str = find_first_in_str(list(digit_map.keys()), s)
-    reversed_str = copy(s)[::-1]
-    last_digit_str = find_first_in_str(list(reversed_digit_map.keys()), reversed_str)
-    first_digit = digit_map[first_digit_str]
-    last_digit = reversed_digit_map[last_digit_str]
-    value_as_str = f"{first_digit}{last_digit}"
-    assert len(value_as_str) == 2
-    return int(value_as_str)
-
-
-def find_first_in_str(l: list[str], s: str) -> str:
-    """Find the item in the list that appears first in s."""
-    first = ""
-    first_idx = len(s)
-    for item in l:
-        idx = s.find(item)
-        if idx != -1 and idx < first_idx:
-            first_idx = idx
-            first = item
-    return first
+    first = _digit_re.search(s)
+    last = _reversed_digit_re.search(s[::-1])
+    assert first is not None and last is not None, f"no digits in {s!r}"
+    return digit_map[first.group()] * 10 + digit_map[last.group()[::-1]]
 
 
 def sum_all_calibration_values(filename: str) -> int:
     """Sum all calibration values in a file."""
-    the_sum = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            the_sum += get_calibration_value(line)
-    return the_sum
+    return sum(get_calibration_value(line) for line in iter_lines(filename))
 
 
 def main() -> None:
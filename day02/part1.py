@@ -3,77 +3,38 @@ from __future__ import annotations
 
 import argparse
 import re
-from dataclasses import dataclass
 
-red_re = re.compile(r"(\d+) red")
-green_re = re.compile(r"(\d+) green")
-blue_re = re.compile(r"(\d+) blue")
+from aoc_tools.files import iter_lines
 
-
-def _count_from_re(r: re.Pattern, s: str) -> int:
-    """Use the regexes above to get the relevant count."""
-    m = r.search(s)
-    if m is None:
-        return 0
-    return int(m.group(1))
-
-
-@dataclass
-class Round:
-    """One round of our game."""
-
-    red: int
-    green: int
-    blue: int
-
-    @classmethod
-    def from_str(cls, s: str) -> Round:
-        """Create a round from a string.
-
-        The string might look like:
-            3 red, 2 green
-            5 blue, 2 red, 1 green
-            7 green, 1 red
-        """
-        red = _count_from_re(red_re, s)
-        green = _count_from_re(green_re, s)
-        blue = _count_from_re(blue_re, s)
-        return cls(red=red, green=green, blue=blue)
+_cube_re = re.compile(rb"(\d+) (red|green|blue)")
 
 
 MAX_RED = 12
 MAX_GREEN = 13
 MAX_BLUE = 14
+_max_by_color = {b"red": MAX_RED, b"green": MAX_GREEN, b"blue": MAX_BLUE}
 
 
-def is_game_possible(game: str) -> bool:
+def is_game_possible(game: bytes) -> bool:
     """Given a string defining a game, is that game possible?"""
-    rounds = game.split(";")
-    for round_str in rounds:
-        r = Round.from_str(round_str)
-        if r.red > MAX_RED or r.green > MAX_GREEN or r.blue > MAX_BLUE:
-            return False
-    return True
-
-
-_game_id_re = re.compile(r"Game (\d+):")
+    return all(int(n) <= _max_by_color[c] for n, c in _cube_re.findall(game))
 
 
-def get_game_id(game: str) -> int:
-    """Get game ID from the line."""
-    m = _game_id_re.search(game)
-    if m is None:
-        raise RuntimeError(f"Unable to find ID of game `{game}`")
-    return int(m.group(1))
+def parse_game(line: bytes) -> tuple[int, bool]:
+    """Get the game ID from the line, and whether that game is possible."""
+    header, _, rounds = line.partition(b":")
+    if not header.startswith(b"Game "):
+        raise RuntimeError(f"Unable to find ID of game `{line!r}`")
+    return int(header[len(b"Game ") :]), is_game_possible(rounds)
 
 
 def sum_valid_ids_in_file(filename: str) -> int:
     """Sum up how many valid IDs are in the file."""
     sum_game_ids = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            if is_game_possible(line):
-                sum_game_ids += get_game_id(line)
+    for line in iter_lines(filename):
+        game_id, possible = parse_game(line)
+        if possible:
+            sum_game_ids += game_id
     return sum_game_ids
 
 
@@ -5,43 +5,13 @@ import argparse
 import re
 from dataclasses import dataclass
 
-red_re = re.compile(r"(\d+) red")
-green_re = re.compile(r"(\d+) green")
-blue_re = re.compile(r"(\d+) blue")
+from aoc_tools.files import iter_lines
 
+# The first letter of the color is enough to tell them apart
+_rgb_re = re.compile(rb"(\d+) (r|g|b)")
 
-def _count_from_re(r: re.Pattern, s: str) -> int:
-    """Use the regexes above to get the relevant count."""
-    m = r.search(s)
-    if m is None:
-        return 0
-    return int(m.group(1))
 
-
-@dataclass
-class Round:
-    """One round of the game."""
-
-    red: int
-    green: int
-    blue: int
-
-    @classmethod
-    def from_str(cls, s: str) -> Round:
-        """Create a round from a string.
-
-        The string might look like:
-            3 red, 2 green
-            5 blue, 2 red, 1 green
-            7 green, 1 red
-        """
-        red = _count_from_re(red_re, s)
-        green = _count_from_re(green_re, s)
-        blue = _count_from_re(blue_re, s)
-        return cls(red=red, green=green, blue=blue)
-
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Game:
     """Game, w/ minimum numbers of cubes needed."""
 
@@ -52,22 +22,21 @@ class Game:
     @classmethod
     def from_str(cls, s: str) -> Game:
         """Make a game from a string."""
-        min_red = 0
-        min_green = 0
-        min_blue = 0
-        all_round_strs = s.split(";")
-        for round_str in all_round_strs:
-            r = Round.from_str(round_str)
-            if r.red > min_red:
-                min_red = r.red
-            if r.green > min_green:
-                min_green = r.green
-            if r.blue > min_blue:
-                min_blue = r.blue
+        return cls.from_bytes(s.encode())
+
+    @classmethod
+    def from_bytes(cls, s: bytes) -> Game:
+        """Make a game from one line of the input file, as bytes."""
+        # We only need the max of each color, so which round it's in doesn't matter
+        min_by_color = {b"r": 0, b"g": 0, b"b": 0}
+        for m in _rgb_re.finditer(s):
+            n = int(m[1])
+            if n > min_by_color[m[2]]:
+                min_by_color[m[2]] = n
         return cls(
-            min_red=min_red,
-            min_green=min_green,
-            min_blue=min_blue,
+            min_red=min_by_color[b"r"],
+            min_green=min_by_color[b"g"],
+            min_blue=min_by_color[b"b"],
         )
 
     def power(self) -> int:
@@ -81,10 +50,9 @@ class Game:
 def sum_game_powers_in_file(filename: str) -> int:
     """Sum up the 'power' of all games in the file."""
     sum_game_powers = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            g = Game.from_str(line)
-            sum_game_powers += g.power()
+    for line in iter_lines(filename):
+        g = Game.from_bytes(line)
+        sum_game_powers += g.power()
     return sum_game_powers
 
 
@@ -3,43 +3,64 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
-import re
+from dataclasses import dataclass, field
+
+from aoc_tools.files import iter_lines
+
+
+def _to_mask(numbers: list[int]) -> int:
+    """Turn a list of numbers into a bitmask of those numbers."""
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
 
-card_re = re.compile(r'Card.*(\d+): (.*) \| (.*)')
 
 @dataclass
 class Card:
     """A scratchcard with winning numbers and numbers that you have."""
     winning_numbers: list[int]
     you_have: list[int]
+    # Bit n is set if n is in winning_numbers/you_have
+    _win_mask: int = field(init=False, repr=False)
+    _have_mask: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Post-init."""
+        self._win_mask = _to_mask(self.winning_numbers)
+        self._have_mask = _to_mask(self.you_have)
 
     @classmethod
     def from_str(cls, s: str) -> Card:
         """Create a Card from a string representation."""
-        m = card_re.search(s)
-        if m is None:
-            raise RuntimeError(f"Unable to create card from string {s}")
-        winning_numbers = [int(e) for e in m.group(2).split()]
-        you_have = [int(e) for e in m.group(3).split()]
+        return cls.from_bytes(s.encode())
+
+    @classmethod
+    def from_bytes(cls, s: bytes) -> Card:
+        """Create a Card from one line of the input file, as bytes."""
+        _, colon, body = s.partition(b":")
+        winning_str, sep, have_str = body.partition(b"|")
+        if not colon or not sep:
+            raise RuntimeError(f"Unable to create card from string {s!r}")
+        winning_numbers = [int(e) for e in winning_str.split()]
+        you_have = [int(e) for e in have_str.split()]
         return cls(winning_numbers=winning_numbers, you_have=you_have)
 
+    def count_wins(self) -> int:
+        """How many of the numbers you have are winning numbers?"""
+        return (self._win_mask & self._have_mask).bit_count()
+
     def score(self) -> int:
         """Score this card."""
-        have_wins = [e in self.winning_numbers for e in self.you_have]
-        count_wins = sum(have_wins)
+        count_wins = self.count_wins()
         if count_wins == 0:
             return 0
         return 2**(count_wins-1)
 
+
 def score_file(filename: str) -> int:
     """Score all cards in a file."""
-    card_sum = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            card = Card.from_str(line)
-            card_sum += card.score()
-    return card_sum
+    return sum(Card.from_bytes(line).score() for line in iter_lines(filename))
 
 
 def main() -> None:
@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import argparse
-from collections import defaultdict
-from dataclasses import dataclass
-import re
+from dataclasses import dataclass, field
 
-card_re = re.compile(r"Card\s*(\d+): (.*) \| (.*)")
+from aoc_tools.files import iter_lines
+
+
+def _to_mask(numbers: list[int]) -> int:
+    """Turn a list of numbers into a bitmask of those numbers."""
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
 
 
 @dataclass
@@ -16,43 +22,45 @@ class Card:
 
     winning_numbers: list[int]
     you_have: list[int]
-    number: int
+    # Bit n is set if n is in winning_numbers/you_have
+    _win_mask: int = field(init=False, repr=False)
+    _have_mask: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Post-init."""
+        self._win_mask = _to_mask(self.winning_numbers)
+        self._have_mask = _to_mask(self.you_have)
 
     @classmethod
     def from_str(cls, s: str) -> Card:
         """Create a Card from a string representation."""
-        m = card_re.search(s)
-        if m is None:
-            raise RuntimeError(f"Unable to create card from string {s}")
-        winning_numbers = [int(e) for e in m.group(2).split()]
-        you_have = [int(e) for e in m.group(3).split()]
-        number = int(m.group(1))
-        return cls(
-            winning_numbers=winning_numbers, you_have=you_have, number=number
-        )
-
-    def gives_cards(self) -> list[int]:
-        """If this card 'wins', what cards does it give you?"""
-        have_wins = [e in self.winning_numbers for e in self.you_have]
-        count_wins = sum(have_wins)
-        if count_wins == 0:
-            return []
-        return list(range(self.number + 1, self.number + count_wins + 1))
+        return cls.from_bytes(s.encode())
+
+    @classmethod
+    def from_bytes(cls, s: bytes) -> Card:
+        """Create a Card from one line of the input file, as bytes."""
+        _, colon, body = s.partition(b":")
+        winning_str, sep, have_str = body.partition(b"|")
+        if not colon or not sep:
+            raise RuntimeError(f"Unable to create card from string {s!r}")
+        winning_numbers = [int(e) for e in winning_str.split()]
+        you_have = [int(e) for e in have_str.split()]
+        return cls(winning_numbers=winning_numbers, you_have=you_have)
+
+    def count_wins(self) -> int:
+        """How many of the numbers you have are winning numbers?"""
+        return (self._win_mask & self._have_mask).bit_count()
 
 
 def score_file(filename: str) -> int:
     """Score all cards in a file."""
-    # Map IDs to how many extra copies we have
-    extra_copies: defaultdict[int, int] = defaultdict(int)
-    scratchcard_count = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            card = Card.from_str(line)
-            how_many_copies = extra_copies[card.number] + 1
-            scratchcard_count += how_many_copies
-            for bonus_card in card.gives_cards():
-                extra_copies[bonus_card] += how_many_copies
-    return scratchcard_count
+    cards = [Card.from_bytes(line) for line in iter_lines(filename)]
+    # Cards are numbered 1..N in file order, so copies[i] is for card i+1
+    copies = [1] * len(cards)
+    for i, card in enumerate(cards):
+        for j in range(i + 1, min(i + 1 + card.count_wins(), len(cards))):
+            copies[j] += copies[i]
+    return sum(copies)
 
 
 def main() -> None:
@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 import re
 import string
-from copy import deepcopy
 from dataclasses import dataclass, field
 
+import numpy
+
+from aoc_tools.files import read_lines
+
 
 @dataclass(frozen=True)
 class MapRange:
@@ -16,6 +20,12 @@ class MapRange:
     src_start: int
     dest_start: int
     length: int
+    # One past the last source number in this range
+    _end: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Post-init."""
+        object.__setattr__(self, "_end", self.src_start + self.length)
 
     @classmethod
     def from_str(cls, s: str) -> MapRange:
@@ -30,7 +40,7 @@ class MapRange:
 
     def convert(self, src_n: int) -> int:
         """Convert a source n to a destination n."""
-        assert src_n in self.source_range(), (
+        assert self.src_start <= src_n < self._end, (
             f"{src_n} is not in range that starts at {self.src_start} with length"
             f" {self.length}"
         )
@@ -54,10 +64,28 @@ class Map:
     src_cat: str = ""  # source category
     dest_cat: str = ""  # destination category
     ranges: list[MapRange] = field(default_factory=list)
+    # The same ranges, as parallel arrays sorted by src_start
+    src_starts: numpy.ndarray = field(init=False)
+    dest_starts: numpy.ndarray = field(init=False)
+    lengths: numpy.ndarray = field(init=False)
+    # And as plain lists, for converting one number at a time
+    _starts: list[int] = field(init=False, repr=False)
+    _ends: list[int] = field(init=False, repr=False)
+    _deltas: list[int] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         """Post-init."""
         self.ranges.sort(key=lambda r: r.src_start)
+        self._starts = [r.src_start for r in self.ranges]
+        self._ends = [r.src_start + r.length for r in self.ranges]
+        self._deltas = [r.dest_start - r.src_start for r in self.ranges]
+        self.src_starts = numpy.array(
+            [r.src_start for r in self.ranges], dtype=numpy.int64
+        )
+        self.dest_starts = numpy.array(
+            [r.dest_start for r in self.ranges], dtype=numpy.int64
+        )
+        self.lengths = numpy.array([r.length for r in self.ranges], dtype=numpy.int64)
 
     @classmethod
     def from_lines(cls, lines: list[str]) -> Map:
@@ -72,11 +100,24 @@ class Map:
 
     def convert(self, src_n: int) -> int:
         """Convert a source in to a destination n."""
-        for r in self.ranges:
-            if src_n in r.source_range():
-                return r.convert(src_n)
+        # Index of the last range that starts at or before src_n
+        i = bisect.bisect_right(self._starts, src_n) - 1
+        if i >= 0 and src_n < self._ends[i]:
+            return src_n + self._deltas[i]
         return src_n
 
+    def convert_many(self, src_ns: numpy.ndarray) -> numpy.ndarray:
+        """Convert an array of source numbers to destination numbers."""
+        # Index of the last range that starts at or before each number
+        idx = numpy.searchsorted(self.src_starts, src_ns, side="right") - 1
+        in_range = (idx >= 0) & (src_ns < self.src_starts[idx] + self.lengths[idx])
+        idx = idx[in_range]
+        out = src_ns.copy()
+        out[in_range] = self.dest_starts[idx] + (
+            src_ns[in_range] - self.src_starts[idx]
+        )
+        return out
+
 
 _seed_to_location: list[str] = [
     "seed",
@@ -110,7 +151,10 @@ class Almanac:
 
     def lowest_location(self) -> int:
         """Return the lowest location that we can get from this set of seeds."""
-        return min(self.seed_to_location(s) for s in self.seeds)
+        cur = numpy.array(self.seeds, dtype=numpy.int64)
+        for keyword in _seed_to_location:
+            cur = self.maps_by_source[keyword].convert_many(cur)
+        return int(cur.min())
 
 
 x_to_y_re = re.compile(r"(\w+)-to-(\w+) map:")
@@ -130,16 +174,14 @@ def map_ranges(lines: list[str]) -> list[tuple[int, int]]:
     for i, line in enumerate(lines):
         if "map" in line:
             maps_start_at.append(i)
-    maps_end_at = deepcopy(maps_start_at[1:])
+    maps_end_at = maps_start_at[1:]
     maps_end_at.append(len(lines))
     return list(zip(maps_start_at, maps_end_at))
 
 
 def parse_file(filename: str) -> int:
     """Parse almanac file and return solution."""
-    almanac_lines: list[str] = []
-    with open(filename, encoding="utf-8") as f:
-        almanac_lines = f.readlines()
+    almanac_lines = read_lines(filename)
     seed_line = almanac_lines[0]
     seed_match = re.search(r"seeds.*:(.*)", seed_line)
     if seed_match is None:
@@ -5,10 +5,11 @@ from __future__ import annotations
 import argparse
 import re
 import string
-from copy import deepcopy
 from dataclasses import dataclass, field
 
-from tqdm import tqdm
+import numpy
+
+from aoc_tools.files import read_lines
 
 
 @dataclass(frozen=True)
@@ -18,6 +19,12 @@ class MapRange:
     src_start: int
     dest_start: int
     length: int
+    # One past the last source number in this range
+    _end: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Post-init."""
+        object.__setattr__(self, "_end", self.src_start + self.length)
 
     @classmethod
     def from_str(cls, s: str) -> MapRange:
@@ -32,7 +39,7 @@ class MapRange:
 
     def convert(self, src_n: int) -> int:
         """Convert a source n to a destination n."""
-        assert src_n in self.source_range(), (
+        assert self.src_start <= src_n < self._end, (
             f"{src_n} is not in range that starts at {self.src_start} with length"
             f" {self.length}"
         )
@@ -43,12 +50,6 @@ class MapRange:
         """Return the range of sources that are in this map."""
         return range(self.src_start, self.src_start + self.length)
 
-    def convert_range(self, start_n: int, size: int) -> tuple[int, int]:
-        """Convert an entire range in this map."""
-        assert start_n in self.source_range()
-        assert start_n + size - 1 in self.source_range()
-        return (self.convert(start_n), size)
-
     @property
     def source_end(self) -> int:
         """Return the largest 'source' number in this range."""
@@ -62,7 +63,11 @@ class MapRange:
         matching a MapRange with src_start = 3 and length = 5,
         you'd want ``range(3,8)``.
         """
-        return self.src_start + self.length
+        return self._end
+
+
+_INT64_MIN = numpy.iinfo(numpy.int64).min
+_INT64_MAX = numpy.iinfo(numpy.int64).max
 
 
 @dataclass
@@ -72,10 +77,21 @@ class Map:
     src_cat: str = ""  # source category
     dest_cat: str = ""  # destination category
     ranges: list[MapRange] = field(default_factory=list)
+    # The same ranges, as parallel arrays sorted by src_start
+    src_starts: numpy.ndarray = field(init=False)
+    dest_starts: numpy.ndarray = field(init=False)
+    lengths: numpy.ndarray = field(init=False)
 
     def __post_init__(self) -> None:
         """Post-init."""
         self.ranges.sort(key=lambda r: r.src_start)
+        self.src_starts = numpy.array(
+            [r.src_start for r in self.ranges], dtype=numpy.int64
+        )
+        self.dest_starts = numpy.array(
+            [r.dest_start for r in self.ranges], dtype=numpy.int64
+        )
+        self.lengths = numpy.array([r.length for r in self.ranges], dtype=numpy.int64)
 
     @classmethod
     def from_lines(cls, lines: list[str]) -> Map:
@@ -88,48 +104,29 @@ class Map:
             ranges.append(MapRange.from_str(line))
         return cls(src_cat, dest_cat, ranges)
 
-    def convert(self, src_n: int) -> int:
-        """Convert a source in to a destination n."""
-        for r in self.ranges:
-            if src_n in r.source_range():
-                return r.convert(src_n)
-        return src_n
-
-    def convert_range(self, start_n: int, size: int) -> list[tuple[int, int]]:
-        """Convert a range to output ranges."""
-        mrs = deepcopy(self.ranges)
-        mrs.sort(key=lambda r: r.src_start)
-        ranges_out: list[tuple[int, int]] = []
-        for mr in mrs:
-            if size == 0:
-                break
-            if start_n > mr.source_end:
-                continue
-            if start_n < mr.src_start:
-                missing_start = start_n
-                missing_size = min(mr.src_start - missing_start, size)
-                ranges_out.append((missing_start, missing_size))
-                start_n = mr.src_start
-                size -= missing_size
-                if size == 0:
-                    break
-            want_size = size
-            if start_n + want_size > mr.range_end:
-                want_size = mr.range_end - start_n
-            got_range = mr.convert_range(start_n, want_size)
-            ranges_out.append(got_range)
-            size -= want_size
-            start_n += want_size
-        if size != 0:
-            ranges_out.append((start_n, size))
-        return ranges_out
-
-    def convert_ranges(self, ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
-        """Convert a list of input ranges to a list of output ranges."""
-        ranges_out: list[tuple[int, int]] = []
-        for start_n, size in tqdm(ranges):
-            ranges_out += self.convert_range(start_n, size)
-        return ranges_out
+    def convert_intervals(
+        self, lo: numpy.ndarray, hi: numpy.ndarray
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Convert half-open intervals [lo, hi) to output intervals.
+
+        Intersects every input interval with every map range at once.
+        """
+        src_lo = self.src_starts
+        src_hi = self.src_starts + self.lengths
+        # The gaps around and between map ranges map to themselves
+        gap_lo = numpy.insert(src_hi, 0, _INT64_MIN)
+        gap_hi = numpy.append(src_lo, _INT64_MAX)
+        all_lo = numpy.concatenate((src_lo, gap_lo))
+        all_hi = numpy.concatenate((src_hi, gap_hi))
+        deltas = numpy.concatenate(
+            (self.dest_starts - self.src_starts, numpy.zeros_like(gap_lo))
+        )
+
+        out_lo = numpy.maximum(lo[:, None], all_lo[None, :])
+        out_hi = numpy.minimum(hi[:, None], all_hi[None, :])
+        overlaps = out_lo < out_hi
+        shift = numpy.broadcast_to(deltas, overlaps.shape)[overlaps]
+        return out_lo[overlaps] + shift, out_hi[overlaps] + shift
 
 
 _seed_to_location: list[str] = [
@@ -154,33 +151,14 @@ class Almanac:
         """Add a map to this almanac."""
         self.maps_by_source[m.src_cat] = m
 
-    def seed_to_location(self, seed: int) -> int:
-        """Convert a seed number to a location number."""
-        cur = seed
-        for keyword in _seed_to_location:
-            m = self.maps_by_source[keyword]
-            cur = m.convert(cur)
-        return cur
-
-    def seed_range_to_min_location(self, start: int, size: int) -> int:
-        """Turn a seed range into a minimum location."""
-        cur = [(start, size)]
-        for keyword in tqdm(_seed_to_location):
-            m = self.maps_by_source[keyword]
-            cur = m.convert_ranges(cur)
-        locations = [e[0] for e in cur]
-        return min(locations)
-
-    def lowest_loc_in_range(self, start: int, size: int) -> int:
-        """Return the lowest location in the given range."""
-        return min(self.seed_to_location(s) for s in tqdm(range(start, start + size)))
-
     def lowest_location(self) -> int:
         """Get lowest location."""
-        return min(
-            self.seed_range_to_min_location(start, size)
-            for start, size in tqdm(self.seed_ranges)
-        )
+        lo = numpy.array([start for start, _ in self.seed_ranges], dtype=numpy.int64)
+        hi = lo + numpy.array([size for _, size in self.seed_ranges], dtype=numpy.int64)
+        # Every seed range goes through each stage together, as arrays
+        for keyword in _seed_to_location:
+            lo, hi = self.maps_by_source[keyword].convert_intervals(lo, hi)
+        return int(lo.min())
 
 
 x_to_y_re = re.compile(r"(\w+)-to-(\w+) map:")
@@ -200,16 +178,14 @@ def map_ranges(lines: list[str]) -> list[tuple[int, int]]:
     for i, line in enumerate(lines):
         if "map" in line:
             maps_start_at.append(i)
-    maps_end_at = deepcopy(maps_start_at[1:])
+    maps_end_at = maps_start_at[1:]
     maps_end_at.append(len(lines))
     return list(zip(maps_start_at, maps_end_at))
 
 
 def parse_file(filename: str) -> int:
     """Parse almanac file and return solution."""
-    almanac_lines: list[str] = []
-    with open(filename, encoding="utf-8") as f:
-        almanac_lines = f.readlines()
+    almanac_lines = read_lines(filename)
     seed_line = almanac_lines[0]
     seed_match = re.search(r"seeds.*:(.*)", seed_line)
     if seed_match is None:
@@ -1,11 +1,13 @@
 """Solution for part 1 of day 6."""
 
 import argparse
-import string
+import math
 from dataclasses import dataclass
 
+import numpy
 
-@dataclass
+
+@dataclass(slots=True)
 class Race:
     """One boat race (with a given time and distance)."""
 
@@ -14,24 +16,19 @@ class Race:
 
     def ways_to_beat(self) -> int:
         """How many ways are there to beat the record?"""
-        shortest = self._shortest_hold()
-        longest = self._longest_hold()
+        # hold * (time - hold) peaks at time / 2, so if that can't win, nothing can
+        if not self.hold_time_beats(self.time // 2):
+            raise ValueError(f"race {self} is unbeatable!")
+        # Winning holds lie between the roots of hold**2 - time*hold + distance;
+        # isqrt rounds down, so this starts at most one short of the first winner
+        root = math.isqrt(self.time * self.time - 4 * self.distance)
+        shortest = (self.time - root) // 2
+        while not self.hold_time_beats(shortest):
+            shortest += 1
+        # The distance is symmetric around time / 2, so the longest hold is too
+        longest = self.time - shortest
         return longest - shortest + 1
 
-    def _shortest_hold(self) -> int:
-        """Shortest hold that beats the record."""
-        for hold in range(0, self.time + 1):
-            if self.hold_time_beats(hold):
-                return hold
-        raise ValueError(f"race {self} is unbeatable!")
-
-    def _longest_hold(self) -> int:
-        """Longest hold that beats the record."""
-        for hold in range(self.time, -1, -1):
-            if self.hold_time_beats(hold):
-                return hold
-        raise RuntimeError(f"race {self} is unbeatable!")
-
     def distance_with_hold(self, hold: int) -> int:
         """How far will you travel if you hold the button for `hold` ms?"""
         speed = hold
@@ -49,20 +46,36 @@ def races_from_file(filename: str) -> list[Race]:
     with open(filename, encoding="utf-8") as f:
         lines = f.readlines()
     assert len(lines) == 2
-    times_strs = [e for e in lines[0].split() if any(d in e for d in string.digits)]
-    distances_strs = [e for e in lines[1].split() if any(d in e for d in string.digits)]
+    times_strs = [e for e in lines[0].split() if e.isdigit()]
+    distances_strs = [e for e in lines[1].split() if e.isdigit()]
     times = [int(e) for e in times_strs]
     distances = [int(e) for e in distances_strs]
     races = [Race(t, d) for t, d in zip(times, distances)]
     return races
 
 
+def ways_to_beat_many(times: numpy.ndarray, distances: numpy.ndarray) -> numpy.ndarray:
+    """How many ways are there to beat each of these races?
+
+    Works the same way as Race.ways_to_beat, but on every race at once, and
+    unbeatable races have 0 ways instead of raising. Times need to be under
+    2**26 or so, for the float square root to be exact enough.
+    """
+    disc = times * times - 4 * distances
+    root = numpy.sqrt(numpy.maximum(disc, 0)).astype(numpy.int64)
+    shortest = (times - root) // 2
+    # Starts at most one short of the first winning hold
+    shortest += shortest * (times - shortest) <= distances
+    half = times // 2
+    beatable = half * (times - half) > distances
+    return numpy.where(beatable, times - 2 * shortest + 1, 0)
+
+
 def ways_to_beat_all(races: list[Race]) -> int:
     """How many ways to beat all these races?"""
-    ways = 1
-    for r in races:
-        ways *= r.ways_to_beat()
-    return ways
+    times = numpy.array([r.time for r in races], dtype=numpy.int64)
+    distances = numpy.array([r.distance for r in races], dtype=numpy.int64)
+    return int(ways_to_beat_many(times, distances).prod())
 
 
 def parse_file(filename: str) -> int:
@@ -1,11 +1,11 @@
 """Solution for part 2 of day 6."""
 
 import argparse
-import string
+import math
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Race:
     """One boat race (with a given time and distance)."""
 
@@ -14,24 +14,19 @@ class Race:
 
     def ways_to_beat(self) -> int:
         """How many ways are there to beat the record?"""
-        shortest = self._shortest_hold()
-        longest = self._longest_hold()
+        # hold * (time - hold) peaks at time / 2, so if that can't win, nothing can
+        if not self.hold_time_beats(self.time // 2):
+            raise ValueError(f"race {self} is unbeatable!")
+        # Winning holds lie between the roots of hold**2 - time*hold + distance;
+        # isqrt rounds down, so this starts at most one short of the first winner
+        root = math.isqrt(self.time * self.time - 4 * self.distance)
+        shortest = (self.time - root) // 2
+        while not self.hold_time_beats(shortest):
+            shortest += 1
+        # The distance is symmetric around time / 2, so the longest hold is too
+        longest = self.time - shortest
         return longest - shortest + 1
 
-    def _shortest_hold(self) -> int:
-        """Shortest hold that beats the record."""
-        for hold in range(0, self.time + 1):
-            if self.hold_time_beats(hold):
-                return hold
-        raise ValueError(f"race {self} is unbeatable!")
-
-    def _longest_hold(self) -> int:
-        """Longest hold that beats the record."""
-        for hold in range(self.time, -1, -1):
-            if self.hold_time_beats(hold):
-                return hold
-        raise RuntimeError(f"race {self} is unbeatable!")
-
     def distance_with_hold(self, hold: int) -> int:
         """How far will you travel if you hold the button for `hold` ms?"""
         speed = hold
@@ -49,8 +44,8 @@ def race_from_file(filename: str) -> Race:
     with open(filename, encoding="utf-8") as f:
         lines = f.readlines()
     assert len(lines) == 2
-    times_strs = [e for e in lines[0].split() if any(d in e for d in string.digits)]
-    distances_strs = [e for e in lines[1].split() if any(d in e for d in string.digits)]
+    times_strs = [e for e in lines[0].split() if e.isdigit()]
+    distances_strs = [e for e in lines[1].split() if e.isdigit()]
     time = int("".join(times_strs))
     distance = int("".join(distances_strs))
     return Race(time, distance)
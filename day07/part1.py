@@ -2,115 +2,80 @@
 from __future__ import annotations
 
 import argparse
-from collections import defaultdict
-from dataclasses import dataclass
 from enum import Enum
 
-card_order = list(str(e) for e in range(2, 10)) + ["T", "J", "Q", "K", "A"]
-
+import numpy
 
-def card_beats(first_card: str, second_card: str) -> bool:
-    """Does the first card beat the second card?"""
-    return card_order.index(first_card) > card_order.index(second_card)
+card_order = list(str(e) for e in range(2, 10)) + ["T", "J", "Q", "K", "A"]
 
 
 class HandType(Enum):
     """The type of a hand in a game of CamelCards."""
 
     HIGH_CARD = 0
-    ONE_PAIR = 10
-    TWO_PAIR = 20
-    THREE = 30  # 3 of a kind
-    FULL_HOUSE = 35
-    FOUR = 40
-    FIVE = 50
-
-    def beats(self, other: HandType) -> bool:
-        """Does this card beat the other one?"""
-        return self.value > other.value
-
-
-@dataclass
-class Hand:
-    """One hand in a game of CamelCards, with accompanying bid."""
-
-    cards: str
-    bid: int = 0
-
-    @classmethod
-    def from_str(cls, s: str) -> Hand:
-        """Create a hand from a line in the input file."""
-        parts = s.split()
-        assert len(parts) == 2
-        cards = parts[0].strip()
-        assert all(c in card_order for c in cards)
-        bid = int(parts[1])
-        return cls(cards=cards, bid=bid)
-
-    @property
-    def hand_type(self) -> HandType:  # pylint: disable=too-many-return-statements
-        """What type of hand is this?"""
-        card_count: defaultdict[str, int] = defaultdict(int)
-        for c in self.cards:
-            card_count[c] += 1
-        # What is the highest number of 'same cards'?
-        mostest = max(card_count.values())
-        if mostest == 5:
-            return HandType.FIVE
-        if mostest == 4:
-            return HandType.FOUR
-        if mostest == 3:
-            if sorted(list(card_count.values())) == [2, 3]:
-                return HandType.FULL_HOUSE
-            return HandType.THREE
-        if mostest == 2:
-            if sorted(list(card_count.values())) == [1, 2, 2]:
-                return HandType.TWO_PAIR
-            return HandType.ONE_PAIR
-        return HandType.HIGH_CARD
-
-    def beats(self, other: Hand) -> bool:
-        """Does this hand beat Other?"""
-        if self.hand_type != other.hand_type:
-            return self.hand_type.beats(other.hand_type)
-        for i in range(0, 5):
-            self_card = self.cards[i]
-            other_card = other.cards[i]
-            if self_card != other_card:
-                return card_beats(self_card, other_card)
-        raise RuntimeError(f"{self} and {other} are the same cards dude")
-
-    def score(self) -> int:
-        """Give this hand a 'score'.
-
-        Hand type is worth 1 trillion * hand type value.
-
-        Then each card contributes 2 digits.
-        """
-        hand_type_score = 1000000000000 * self.hand_type.value
-        card_indexes = [card_order.index(c) for c in self.cards]
-        card_score_list = [f"{i:02}" for i in card_indexes]
-        card_score_str = "".join(card_score_list)
-        card_score_str = card_score_str.lstrip("0")
-        card_score = int(card_score_str)
-        return hand_type_score + card_score
-
-    def wins(self, rank: int) -> int:
-        """How much does this hand win? (Bid * rank)"""
-        return self.bid * rank
-
-
-def create_hands(filename: str) -> list[Hand]:
-    """Create hands from file."""
-    with open(filename, encoding="utf-8") as f:
-        return [Hand.from_str(line) for line in f]
+    ONE_PAIR = 1
+    TWO_PAIR = 2
+    THREE = 3  # 3 of a kind
+    FULL_HOUSE = 4
+    FOUR = 5
+    FIVE = 6
+
+
+def hand_type_from_counts(most: int, second: int) -> HandType:
+    """Get the type of a hand from its two biggest counts of matching cards."""
+    if most == 5:
+        return HandType.FIVE
+    if most == 4:
+        return HandType.FOUR
+    if most == 3:
+        return HandType.FULL_HOUSE if second == 2 else HandType.THREE
+    if most == 2:
+        return HandType.TWO_PAIR if second == 2 else HandType.ONE_PAIR
+    return HandType.HIGH_CARD
+
+
+# Hand type values, indexed by [most, second] (see hand_type_from_counts)
+_type_table = numpy.array([
+    [hand_type_from_counts(most, second).value for second in range(6)]
+    for most in range(6)
+])
+# Card ranks, indexed by the card's byte; -1 for anything that isn't a card
+_rank_lut = numpy.full(256, -1, dtype=numpy.int64)
+_rank_lut[[ord(c) for c in card_order]] = numpy.arange(len(card_order))
+_card_shifts = numpy.array([16, 12, 8, 4, 0])
+
+
+def score_hands(cards: list[str]) -> numpy.ndarray:
+    """Score many hands at once.
+
+    The hand type is the top 4 bits, then each card contributes 4 bits.
+    """
+    if any(len(c) != 5 for c in cards):
+        raise ValueError("every hand should have 5 cards")
+    ranks = _rank_lut[numpy.frombuffer("".join(cards).encode(), dtype=numpy.uint8)]
+    ranks = ranks.reshape(-1, 5)
+    if (ranks < 0).any():
+        raise ValueError("found something that isn't a card")
+    # counts[i, r] is how many cards of rank r hand i has
+    counts = (ranks[:, :, None] == numpy.arange(len(card_order))).sum(axis=1)
+    top = numpy.sort(counts, axis=1)[:, ::-1]
+    types = _type_table[top[:, 0], top[:, 1]]
+    return (types << 20) | (ranks << _card_shifts).sum(axis=1)
 
 
 def parse_file(filename: str) -> int:
     """Parse the whole file, do the puzzle, etc."""
-    hands = create_hands(filename)
-    hands.sort(key=lambda h: h.score())
-    return sum(h.wins(i + 1) for i, h in enumerate(hands))
+    cards: list[str] = []
+    bids: list[int] = []
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            hand_cards, bid = line.split()
+            cards.append(hand_cards)
+            bids.append(int(bid))
+    # Stable, so equal hands keep their order like they did with list.sort
+    order = numpy.argsort(score_hands(cards), kind="stable")
+    ranks = numpy.arange(1, len(cards) + 1)
+    return int((numpy.array(bids, dtype=numpy.int64)[order] * ranks).sum())
 
 
 def main() -> None:
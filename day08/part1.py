@@ -2,13 +2,10 @@
 from __future__ import annotations
 
 import argparse
-import re
 from dataclasses import dataclass, field
 
-_node_re = re.compile(r"(...) = \((...), (...)\)")
 
-
-@dataclass
+@dataclass(slots=True)
 class Node:
     """One node in our network."""
 
@@ -19,17 +16,45 @@ class Node:
     @classmethod
     def from_str(cls, s: str) -> Node:
         """Convert a line into a Node."""
-        m = _node_re.search(s)
-        if m is None:
+        # Always laid out like "AAA = (BBB, CCC)"
+        if s[3:7] != " = (" or s[10:12] != ", " or s[15:16] != ")":
             raise RuntimeError(f"Does not look node-shaped to me: {s}")
-        return cls(
-            name=m.group(1),
-            left=m.group(2),
-            right=m.group(3),
-        )
+        return cls(name=s[0:3], left=s[7:10], right=s[12:15])
+
+
+def _steps_to_end(
+    start: int,
+    left: list[int],
+    right: list[int],
+    go_right: list[bool],
+    is_end: list[bool],
+) -> int:
+    """Count the steps it takes to get from node `start` to an end node.
+
+    Nodes are numbered; left[n] and right[n] are the numbers of node n's
+    neighbours, and go_right[i] says which way step i of the directions goes.
+    """
+    # Which neighbour list to follow at each position in the directions
+    tables = [right if r else left for r in go_right]
+    if not tables:
+        raise ValueError("can't walk anywhere without directions")
+    cur = start
+    steps_taken = 0
+    # Where each pass through the directions has started. Once a pass starts
+    # somewhere it already has, the walk is going round in circles.
+    pass_starts: set[int] = set()
+    # One pass through the directions per outer loop, so no modulo per step
+    while cur not in pass_starts:
+        pass_starts.add(cur)
+        for table in tables:
+            if is_end[cur]:
+                return steps_taken
+            cur = table[cur]
+            steps_taken += 1
+    raise ValueError(f"node {start} never gets to an end node")
 
 
-@dataclass
+@dataclass(slots=True)
 class Network:
     """A network, with many nodes."""
 
@@ -42,21 +67,22 @@ class Network:
             raise ValueError(f"network already has a node named {n.name}")
         self.nodes[n.name] = n
 
+    def _index(self) -> tuple[dict[str, int], list[int], list[int]]:
+        """Number the nodes, then list each node's neighbours by number.
+
+        Returns the numbers by name, and the left and right neighbours.
+        """
+        ids = {name: i for i, name in enumerate(self.nodes)}
+        left = [ids[n.left] for n in self.nodes.values()]
+        right = [ids[n.right] for n in self.nodes.values()]
+        return ids, left, right
+
     def walk_to_zzz(self) -> int:
         """How many steps does it take to go from AAA to ZZZ?"""
-        cur = self.nodes["AAA"]
-        dir_idx = 0
-        steps_taken = 0
-        while cur.name != "ZZZ":
-            if self.directions[dir_idx] == "L":
-                cur = self.nodes[cur.left]
-            else:
-                cur = self.nodes[cur.right]
-            steps_taken += 1
-            dir_idx += 1
-            if dir_idx == len(self.directions):
-                dir_idx = 0
-        return steps_taken
+        ids, left, right = self._index()
+        go_right = [d == "R" for d in self.directions]
+        is_end = [name == "ZZZ" for name in self.nodes]
+        return _steps_to_end(ids["AAA"], left, right, go_right, is_end)
 
 
 def file_to_network(filename: str) -> Network:
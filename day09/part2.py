@@ -3,26 +3,35 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import math
+
+import numpy
+
+
+@functools.cache
+def _coefficients(n: int) -> tuple[int, ...]:
+    """Weights that extrapolate the value before a length-n sequence.
+
+    Differencing the sequence all the way down and subtracting back up works
+    out to sum((-1)**k * comb(n, k + 1) * seq[k]), so this gives those weights.
+    """
+    return tuple((-1) ** k * math.comb(n, k + 1) for k in range(n))
 
 
 def gen_next_value(seq: list[int]) -> int:
-    """Generate the next value from the 'history' list."""
-    diffs = [seq[i + 1] - seq[i] for i in range(0, len(seq) - 1)]
-    if not all(e == 0 for e in diffs):
-        next_diff_value = gen_next_value(diffs)
-        diffs.insert(0, next_diff_value)
-    return seq[0] - diffs[0]
+    """Generate the previous value from the 'history' list."""
+    return sum(c * e for c, e in zip(_coefficients(len(seq)), seq))
 
 
 def parse_file(filename: str) -> int:
-    """Generate next value from each line, then sum those."""
-    next_val_sum = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            as_ints = [int(e) for e in line.split()]
-            incr_by = gen_next_value(as_ints)
-            next_val_sum += incr_by
-    return next_val_sum
+    """Generate previous value from each line, then sum those.
+
+    Every line has to be the same length, so they can all be done at once.
+    """
+    history = numpy.loadtxt(filename, dtype=numpy.int64, ndmin=2)
+    weights = numpy.array(_coefficients(history.shape[1]), dtype=numpy.int64)
+    return int((history @ weights).sum())
 
 
 def main() -> None:
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy
+
 
 class Direction(Enum):
     """A compass direction."""
@@ -28,7 +30,80 @@ class Direction(Enum):
         raise ValueError(f"Cannot reverse {self}")
 
 
-@dataclass
+# One bit per direction, so the directions a pipe goes fit in one int
+_NORTH = 1
+_WEST = 2
+_EAST = 4
+_SOUTH = 8
+_DIR_BIT = {
+    Direction.NORTH: _NORTH,
+    Direction.WEST: _WEST,
+    Direction.EAST: _EAST,
+    Direction.SOUTH: _SOUTH,
+}
+_DIR_FROM_BIT = {bit: d for d, bit in _DIR_BIT.items()}
+# Which directions each shape connects to
+_SHAPE_DIRS = {
+    "|": _NORTH | _SOUTH,
+    "-": _EAST | _WEST,
+    "L": _NORTH | _EAST,
+    "J": _NORTH | _WEST,
+    "7": _SOUTH | _WEST,
+    "F": _SOUTH | _EAST,
+    ".": 0,
+    "S": 0,
+}
+# The same, indexed by the shape's byte
+_SHAPE_DIRS_LUT = numpy.zeros(256, dtype=numpy.uint8)
+_SHAPE_DIRS_LUT[[ord(c) for c in _SHAPE_DIRS]] = list(_SHAPE_DIRS.values())
+
+
+def _exit_dir(shape_dirs: int, came_from: Direction) -> Direction | None:
+    """Which way does a pipe going `shape_dirs` go out, if you came in from X?
+
+    None if the pipe doesn't go towards X.
+    """
+    # A pipe goes two ways, so one must be where we came from
+    return _DIR_FROM_BIT.get(shape_dirs & ~_DIR_BIT[came_from])
+
+
+# For each way out of a cell: the row and column change, and which way you
+# come in to the next cell
+_STEP = {
+    _NORTH: (-1, 0, _SOUTH),
+    _WEST: (0, -1, _EAST),
+    _EAST: (0, 1, _WEST),
+    _SOUTH: (1, 0, _NORTH),
+}
+
+
+def _walk_loop(
+    dirs: list[list[int]], start_row: int, start_col: int, out_bit: int
+) -> tuple[list[int], list[int]]:
+    """Follow the pipe loop from the start until it comes back round.
+
+    `dirs` has the direction bitmask of each cell, and we leave the start going
+    `out_bit`. Returns the rows and columns of every cell on the loop, in order,
+    starting with the start.
+    """
+    rows = [start_row]
+    cols = [start_col]
+    row = start_row
+    col = start_col
+    while True:
+        d_row, d_col, in_bit = _STEP[out_bit]
+        row += d_row
+        col += d_col
+        if row == start_row and col == start_col:
+            return rows, cols
+        rows.append(row)
+        cols.append(col)
+        out_bit = dirs[row][col] & ~in_bit
+        if out_bit not in _STEP:
+            raise RuntimeError(f"Not sure how to leave cell at {row}, {col}")
+
+
+@dataclass(slots=True)
 class Cell:
     """One cell in our maze."""
 
@@ -42,19 +117,19 @@ class Cell:
 
     def goes_north(self) -> bool:
         """Does this pipe connect to the north?"""
-        return self.shape in ("|", "L", "J")
+        return bool(_SHAPE_DIRS[self.shape] & _NORTH)
 
     def goes_west(self) -> bool:
         """Does this pipe connect to the west?"""
-        return self.shape in ("-", "J", "7")
+        return bool(_SHAPE_DIRS[self.shape] & _WEST)
 
     def goes_east(self) -> bool:
         """Does this pipe connect to the east?"""
-        return self.shape in ("-", "L", "F")
+        return bool(_SHAPE_DIRS[self.shape] & _EAST)
 
     def goes_south(self) -> bool:
         """Does this pipe connect to the south?"""
-        return self.shape in ("|", "7", "F")
+        return bool(_SHAPE_DIRS[self.shape] & _SOUTH)
 
     def directions(self) -> tuple[Direction, Direction]:
         """Return the two directions that this pipe goes."""
@@ -76,14 +151,9 @@ class Cell:
 
     def next_dir(self, came_from: Direction) -> Direction:
         """If you came in from X, where do you go out?"""
-        if self.goes_north() and came_from != Direction.NORTH:
-            return Direction.NORTH
-        if self.goes_west() and came_from != Direction.WEST:
-            return Direction.WEST
-        if self.goes_east() and came_from != Direction.EAST:
-            return Direction.EAST
-        if self.goes_south() and came_from != Direction.SOUTH:
-            return Direction.SOUTH
+        next_dir = _exit_dir(_SHAPE_DIRS[self.shape], came_from)
+        if next_dir is not None:
+            return next_dir
         raise RuntimeError(
             f"Not sure how to leave cell of shape {self.shape} when entering from"
             f" {came_from}"
@@ -97,7 +167,7 @@ class Cell:
         """
         if len(char) != 1:
             raise ValueError("pass in precisely one character")
-        if char not in ("|", "-", "L", "J", "7", "F", ".", "S"):
+        if char not in _SHAPE_DIRS:
             raise ValueError(f"unrecognized cell character {char}")
         is_start = char == "S"
         return cls(shape=char, is_start=is_start, reachable_from_start=is_start)
@@ -111,7 +181,7 @@ class Cell:
         return "F"
 
 
-@dataclass
+@dataclass(slots=True)
 class Matrix:
     """A 2x2 matrix."""
 
@@ -131,67 +201,80 @@ class Matrix:
         return (self.x1 * self.y2) - (self.y1 * self.x2)
 
 
-@dataclass
+@dataclass(slots=True)
 class Maze:
     """Our maze: a bunch of cells + where to start."""
 
-    cells: list[list[Cell]]
+    # Each cell's shape character, as a byte
+    shapes: numpy.ndarray
     start_row: int
     start_col: int
+    # Which cells we can get to from the start
+    reachable: numpy.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Post-init."""
+        self.reachable = self.shapes == ord("S")
 
     @classmethod
     def from_strs(cls, rows: list[str]) -> Maze:
         """Create a pipe maze from a list of strings."""
+        stripped_rows = [row.strip() for row in rows if row.strip()]
+        for row in stripped_rows:
+            for char in row:
+                if char not in _SHAPE_DIRS:
+                    raise ValueError(f"unrecognized cell character {char}")
+        if len({len(row) for row in stripped_rows}) > 1:
+            raise ValueError("rows are not all the same length")
+        shapes = numpy.array(
+            [list(row.encode()) for row in stripped_rows], dtype=numpy.uint8
+        )
         start_row = 0
         start_col = 0
-        cells: list[list[Cell]] = []
-        for i, row in enumerate(rows):
-            cell_row: list[Cell] = []
-            stripped_row = row.strip()
-            for j, char in enumerate(stripped_row):
-                new_cell = Cell.from_char(char)
-                cell_row.append(new_cell)
-                if new_cell.is_start:
-                    start_row = i
-                    start_col = j
-            cells.append(cell_row)
-        return cls(cells, start_row, start_col)
+        starts = numpy.argwhere(shapes == ord("S"))
+        if len(starts):
+            start_row, start_col = (int(e) for e in starts[-1])
+        return cls(shapes, start_row, start_col)
+
+    def cell(self, row_idx: int, col_idx: int) -> Cell:
+        """Get the cell at this row and column."""
+        return Cell(
+            shape=chr(self.shapes[row_idx, col_idx]),
+            is_start=(row_idx, col_idx) == (self.start_row, self.start_col),
+            reachable_from_start=bool(self.reachable[row_idx, col_idx]),
+        )
+
+    def _dirs(self, row_idx: int, col_idx: int) -> int:
+        """Bitmask of the directions that the pipe at this row and column goes."""
+        return int(_SHAPE_DIRS_LUT[self.shapes[row_idx, col_idx]])
 
     def print_pipes(self) -> None:
         """Print the pipes."""
-        for row in self.cells:
-            out_row = "".join([c.shape for c in row])
-            print(out_row)
+        for row in self.shapes:
+            print(row.tobytes().decode())
 
     def print_reachability(self) -> None:
         """Print the reachability status."""
-        for row in self.cells:
-            out_row = "".join([c.reachable_char() for c in row])
-            print(out_row)
+        out = numpy.where(self.reachable, ord("T"), ord("F")).astype(numpy.uint8)
+        out[self.shapes == ord(".")] = ord(".")
+        for row in out:
+            print(row.tobytes().decode())
 
     def find_start_shape(self) -> str:
         """Find the shape of the starting pipe."""
-        goes_north: bool = False
-        goes_south: bool = False
-        goes_west: bool = False
-        goes_east: bool = False
-        if (
-            self.start_row != 0
-            and self.cells[self.start_row - 1][self.start_col].goes_south()
-        ):
-            goes_north = True
-        if (self.start_row < (len(self.cells) - 1)) and self.cells[self.start_row + 1][
-            self.start_col
-        ].goes_north():
-            goes_south = True
-        if (self.start_col != 0) and self.cells[self.start_row][
-            self.start_col - 1
-        ].goes_east():
-            goes_west = True
-        if (self.start_col < (len(self.cells[0]) - 1)) and self.cells[self.start_row][
-            self.start_col + 1
-        ].goes_west():
-            goes_east = True
+        num_rows, num_cols = self.shapes.shape
+        goes_north = self.start_row != 0 and bool(
+            self._dirs(self.start_row - 1, self.start_col) & _SOUTH
+        )
+        goes_south = self.start_row < num_rows - 1 and bool(
+            self._dirs(self.start_row + 1, self.start_col) & _NORTH
+        )
+        goes_west = self.start_col != 0 and bool(
+            self._dirs(self.start_row, self.start_col - 1) & _EAST
+        )
+        goes_east = self.start_col < num_cols - 1 and bool(
+            self._dirs(self.start_row, self.start_col + 1) & _WEST
+        )
         if goes_north and goes_south:
             return "|"
         if goes_east and goes_west:
@@ -209,45 +292,27 @@ class Maze:
     def set_start_shape(self) -> None:
         """Set the shape of the starting pipe."""
         start_shape = self.find_start_shape()
-        self.cells[self.start_row][self.start_col].shape = start_shape
+        self.shapes[self.start_row, self.start_col] = ord(start_shape)
 
     def walk_tiles(self) -> None:
         """Walk the tiles and set them as reachable."""
         self.print_pipes()
         self.set_start_shape()
-        cur_row = self.start_row
-        cur_col = self.start_col
-        # print("starting at", cur_row, cur_col)
-        self._visit(cur_row, cur_col)
-        start_cell = self.cells[cur_row][cur_col]
-        cur_dir: Direction
-        if start_cell.goes_north():
-            cur_dir = Direction.NORTH
-        elif start_cell.goes_west():
-            cur_dir = Direction.WEST
-        elif start_cell.goes_east():
-            cur_dir = Direction.EAST
-        elif start_cell.goes_south():
-            cur_dir = Direction.SOUTH
-        else:
+        start_dirs = self._dirs(self.start_row, self.start_col)
+        if not start_dirs:
             raise RuntimeError("starting cell does not seem to go anywhere")
-        cur_row, cur_col, cur_dir = self._next_idx(cur_row, cur_col, cur_dir)
-        # print(cur_row, cur_col, cur_dir)
-        while not (cur_row == self.start_row and cur_col == self.start_col):
-            # print("visiting", cur_row, cur_col)
-            self._visit(cur_row, cur_col)
-            cur_row, cur_col, cur_dir = self._next_idx(cur_row, cur_col, cur_dir)
-            # print("next up:", cur_row, cur_col, cur_dir)
-        # print("all done!")
+        # Plain nested lists, since indexing NumPy one cell at a time is slow
+        dirs = _SHAPE_DIRS_LUT[self.shapes].tolist()
+        rows, cols = _walk_loop(
+            dirs, self.start_row, self.start_col, start_dirs & -start_dirs
+        )
+        self.reachable[rows, cols] = True
         self.print_reachability()
 
     def count_reachable_tiles(self) -> int:
         """Count how many tiles are reachable from the start."""
         self.walk_tiles()
-        reachable = 0
-        for cell_row in self.cells:
-            reachable += sum(c.reachable_from_start for c in cell_row)
-        return reachable
+        return int(self.reachable.sum())
 
     def enclosed_area(self) -> float:
         """Find the enclosed area.
@@ -255,7 +320,7 @@ class Maze:
         Uses the shoelace theorem.
         """
         self.set_start_shape()
-        dirs = self.cells[self.start_row][self.start_col].directions()
+        dirs = self.cell(self.start_row, self.start_col).directions()
         for d in dirs:
             print("trying to start by going", d)
             res = self._enclosed_area(d)
@@ -268,20 +333,12 @@ class Maze:
     def _enclosed_area(self, start_dir: Direction) -> float:
         """Find the enclosed area going in a particular direction."""
         self.set_start_shape()
-        cur_row = self.start_row
-        cur_col = self.start_col
-        self._visit(cur_row, cur_col)
-        cell_coords: list[tuple[int, int]] = []
-        cur_dir = start_dir
-        cell_coords.append((cur_row, cur_col))
-        cur_row, cur_col, cur_dir = self._next_idx(cur_row, cur_col, cur_dir)
-        # print(cur_row, cur_col, cur_dir)
-        while not (cur_row == self.start_row and cur_col == self.start_col):
-            # print("visiting", cur_row, cur_col)
-            self._visit(cur_row, cur_col)
-            cell_coords.append((cur_row, cur_col))
-            cur_row, cur_col, cur_dir = self._next_idx(cur_row, cur_col, cur_dir)
-            # print("next up:", cur_row, cur_col, cur_dir)
+        # Leave the start the other way from start_dir
+        out_bit = self._dirs(self.start_row, self.start_col) & ~_DIR_BIT[start_dir]
+        dirs = _SHAPE_DIRS_LUT[self.shapes].tolist()
+        rows, cols = _walk_loop(dirs, self.start_row, self.start_col, out_bit)
+        self.reachable[rows, cols] = True
+        cell_coords = list(zip(rows, cols))
         matrices: list[Matrix] = []
         for i in range(0, len(cell_coords) - 1):
             x1, y1 = cell_coords[i]
@@ -304,26 +361,6 @@ class Maze:
         print("area", area, "number of boundary points", boundary_points)
         return int(area + 1 - (boundary_points / 2))
 
-    def _visit(self, row_idx: int, col_idx: int) -> None:
-        """Visit a tile."""
-        self.cells[row_idx][col_idx].reachable_from_start = True
-
-    def _next_idx(
-        self, row_idx: int, col_idx: int, in_dir: Direction
-    ) -> tuple[int, int, Direction]:
-        """Get indexes, and direction, of the next cell to visit."""
-        next_dir = self.cells[row_idx][col_idx].next_dir(in_dir)
-        if next_dir == Direction.NORTH:
-            # If you go north, you actually "enter" a cell from the south
-            return (row_idx - 1, col_idx, Direction.SOUTH)
-        if next_dir == Direction.WEST:
-            return (row_idx, col_idx - 1, Direction.EAST)
-        if next_dir == Direction.EAST:
-            return (row_idx, col_idx + 1, Direction.WEST)
-        if next_dir == Direction.SOUTH:
-            return (row_idx + 1, col_idx, Direction.NORTH)
-        raise RuntimeError(f"Unrecognized direction {next_dir}")
-
 
 def parse_file(filename: str) -> int:
     """Turn file into maze, return the farthest distance from start."""
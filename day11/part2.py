@@ -4,52 +4,38 @@ from __future__ import annotations
 
 import argparse
 from dataclasses import dataclass, field
-from itertools import combinations
-
-EXP_FACTOR = 1000000
-
-
-def _sorted_range(x: int, y: int) -> range:
-    if x < y:
-        return range(x, y)
-    return range(y, x)
 
+import numpy
 
-@dataclass(frozen=True)
-class Galaxy:
-    """A galaxy, at some position in the universe."""
+EXP_FACTOR = 1000000
 
-    row: int
-    col: int
 
-    def distance_to(
-        self, other: Galaxy, exp_rows: list[int], exp_cols: list[int]
-    ) -> int:
-        """Distance between two galaxies, after the universe has expanded."""
-        dist = abs(self.row - other.row) + abs(self.col - other.col)
-        for row in exp_rows:
-            if row in _sorted_range(self.row, other.row):
-                dist += EXP_FACTOR - 1
-        for col in exp_cols:
-            if col in _sorted_range(self.col, other.col):
-                dist += EXP_FACTOR - 1
-        return dist
+def sum_of_distances(coords: numpy.ndarray) -> int:
+    """Sum up the distance between every pair of these coordinates."""
+    # Once sorted, each coordinate is at least as big as the i before it and
+    # no bigger than the n - 1 - i after it, so it's added i times and
+    # subtracted n - 1 - i times
+    n = len(coords)
+    return int(numpy.dot(2 * numpy.arange(n) - n + 1, numpy.sort(coords)))
 
 
 @dataclass
 class Universe:
     """Universe. It's expanding."""
 
-    image: list[list[str]]
-    exp_rows: list[int] = field(default_factory=list)
-    exp_cols: list[int] = field(default_factory=list)
+    # Each pixel as a byte, one row per line
+    image: numpy.ndarray
+    # The rows and columns with no galaxies in them (filled in by expand)
+    exp_rows: numpy.ndarray = field(
+        default_factory=lambda: numpy.zeros(0, dtype=numpy.int64)
+    )
+    exp_cols: numpy.ndarray = field(
+        default_factory=lambda: numpy.zeros(0, dtype=numpy.int64)
+    )
 
     def pretty(self) -> str:
         """String representation."""
-        lines: list[str] = []
-        for row in self.image:
-            lines.append("".join(row))
-        return "\n".join(lines)
+        return "\n".join(row.tobytes().decode() for row in self.image)
 
     @classmethod
     def from_strs(cls, lines: list[str]) -> Universe:
@@ -57,51 +43,40 @@ class Universe:
 
         Does NOT expand.
         """
-        image: list[list[str]] = []
-        for line in lines:
-            line = line.strip()
-            as_list = list(line)
-            image.append(as_list)
-        return cls(image)
+        stripped_lines = [line.strip() for line in lines if line.strip()]
+        if len({len(line) for line in stripped_lines}) > 1:
+            raise ValueError("lines are not all the same length")
+        # One buffer for the whole image, rather than one int per pixel
+        data = "".join(stripped_lines).encode()
+        image = numpy.frombuffer(data, dtype=numpy.uint8)
+        return cls(image.reshape(len(stripped_lines), -1))
 
     def expand(self) -> None:
-        """Make the universe expand."""
-        rows_to_expand: list[int] = []
-        for i, row in enumerate(self.image):
-            if all(c == "." for c in row):
-                rows_to_expand.append(i)
-        rows_to_expand.sort()
-        self.exp_rows = rows_to_expand
-
-        col_count = len(self.image[0])
-        cols_to_expand: list[int] = []
-        for i in range(col_count):
-            if all(row[i] == "." for row in self.image):
-                cols_to_expand.append(i)
-        cols_to_expand.sort()
-        self.exp_cols = cols_to_expand
-
-    def find_galaxies(self) -> list[Galaxy]:
-        """Find all the galaxies in this universe.
+        """Make the universe expand.
+
+        Rather than adding rows and columns to the image, this just notes which
+        ones are empty, and so need to grow.
+        """
+        empty = self.image == ord(".")
+        self.exp_rows = numpy.flatnonzero(empty.all(axis=1))
+        self.exp_cols = numpy.flatnonzero(empty.all(axis=0))
+
+    def find_galaxies(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the rows and columns of all the galaxies in this universe.
 
         Does NOT expand.
         """
-        galaxies: list[Galaxy] = []
-        for i, row in enumerate(self.image):
-            for j, char in enumerate(row):
-                if char == "#":
-                    galaxies.append(Galaxy(i, j))
-        return galaxies
+        rows, cols = numpy.nonzero(self.image == ord("#"))
+        return rows.astype(numpy.int64), cols.astype(numpy.int64)
 
     def expand_and_sum_shortest_path(self) -> int:
         """Expand the universe, then find sum of shortest paths."""
-        print("expanding...")
         self.expand()
-        galaxies = self.find_galaxies()
-        return sum(
-            g1.distance_to(g2, exp_rows=self.exp_rows, exp_cols=self.exp_cols)
-            for g1, g2 in combinations(galaxies, r=2)
-        )
+        rows, cols = self.find_galaxies()
+        # Each empty row or column before a galaxy moves it over by EXP_FACTOR - 1
+        rows += (EXP_FACTOR - 1) * numpy.searchsorted(self.exp_rows, rows)
+        cols += (EXP_FACTOR - 1) * numpy.searchsorted(self.exp_cols, cols)
+        return sum_of_distances(rows) + sum_of_distances(cols)
 
 
 def parse_file(filename: str) -> int:
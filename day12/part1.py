@@ -3,8 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import itertools
-from copy import deepcopy
 from dataclasses import dataclass
 
 UNKNOWN = "?"
@@ -28,23 +26,44 @@ class Row:
 
     def count_arrangements(self) -> int:
         """Number of possible valid arrangements in this row."""
-        count = 0
-        how_many_unknown = sum(c == UNKNOWN for c in self.row)
-        for new_combo in itertools.product(
-            [OPERATIONAL, DAMAGED], repeat=how_many_unknown
-        ):
-            copy_row = deepcopy(self.row)
-            for e in new_combo:
-                copy_row = copy_row.replace(UNKNOWN, e, 1)
-            assert UNKNOWN not in copy_row
-            try_groups = copy_row.split(OPERATIONAL)
-            try_groups = [e for e in try_groups if len(e) != 0]
-            if len(try_groups) != len(self.groups):
-                # print(try_groups, "not even the right number of groups")
-                continue
-            if [len(e) for e in try_groups] == self.groups:
-                count += 1
-        return count
+        row = self.row
+        groups = self.groups
+        n = len(row)
+        # next_spring[pos] is the first spring from pos on that isn't known to
+        # be operational, so runs of operational springs get skipped in one go.
+        # run[pos] is how many springs from pos on could all be damaged.
+        next_spring = list(range(n + 2))
+        run = [0] * (n + 1)
+        for pos in range(n - 1, -1, -1):
+            if row[pos] == OPERATIONAL:
+                next_spring[pos] = next_spring[pos + 1]
+            else:
+                run[pos] = run[pos + 1] + 1
+        # Keyed on where we are in the row and in the groups
+        memo: dict[tuple[int, int], int] = {}
+
+        def count_from(pos: int, group_idx: int) -> int:
+            """Number of ways to fit groups[group_idx:] into row[pos:]."""
+            pos = next_spring[pos]
+            key = (pos, group_idx)
+            if key in memo:
+                return memo[key]
+            count = 0
+            if group_idx == len(groups):
+                # Valid as long as no damaged springs are left over
+                count = int(row.find(DAMAGED, pos) == -1)
+            elif pos < n:
+                if row[pos] == UNKNOWN:
+                    count += count_from(pos + 1, group_idx)
+                end = pos + groups[group_idx]
+                # The group fits here, and something can separate it from the
+                # next one
+                if run[pos] >= groups[group_idx] and (end == n or row[end] != DAMAGED):
+                    count += count_from(end + 1, group_idx + 1)
+            memo[key] = count
+            return count
+
+        return count_from(0, 0)
 
 
 def parse_file(filename: str) -> int:
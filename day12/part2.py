@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import functools
 from dataclasses import dataclass
 
 from tqdm import tqdm
@@ -12,63 +11,53 @@ UNKNOWN = "?"
 OPERATIONAL = "."
 DAMAGED = "#"
 
+_DAMAGED_BITS = str.maketrans("?.#", "001")
+_MAYBE_DAMAGED_BITS = str.maketrans("?.#", "101")
 
-@functools.cache
-def calc(row: str, groups: tuple[int]) -> int:
+
+def calc(row: str, groups: tuple[int, ...]) -> int:
     """Calculate number of ways to make the groups."""
-    # No more groups left; might be valid
-    if not groups:
-        # If there's no more damaged springs, there's no more groups
-        # (if there's unknowns in there, we can make them all .)
-        if DAMAGED not in row:
-            return 1
-        return 0
-
-    if not row:
-        # Groups exist, but row is done. whoops!
-        return 0
-
-    next_char = row[0]
-    if next_char == DAMAGED:
-        return calc_damaged(row, groups)
-    if next_char == OPERATIONAL:
-        return calc_operational(row, groups)
-    if next_char == UNKNOWN:
-        return calc_damaged(row, groups) + calc_operational(row, groups)
-    raise RuntimeError(f"Unrecognized character {next_char}")
-
-
-@functools.cache
-def calc_damaged(row: str, groups: tuple[int]) -> int:
-    """Assume that the first character is a damaged spring."""
-    next_group = groups[0]
-    this_group = row[:next_group]
-    this_group = this_group.replace(UNKNOWN, DAMAGED)
-
-    if this_group != next_group * DAMAGED:
-        return 0
-
-    # Rest of the row is just this group
-    if len(row) == next_group:
-        # it's the last group. woohoo.
-        if len(groups) == 1:
-            return 1
-        # otherwise, there are too many groups
-        return 0
-
-    # Make sure next character can be a separator
-    if row[next_group] in (UNKNOWN, OPERATIONAL):
-        return calc(row[next_group + 1 :], groups[1:])
-
-    # Can't be handled; isn't possible
-    return 0
-
-
-@functools.cache
-def calc_operational(row: str, groups: tuple[int]) -> int:
-    """Assume that the first character is operational."""
-    # Just skip it! look for the next interesting thing
-    return calc(row[1:], groups)
+    for char in row:
+        if char not in (UNKNOWN, OPERATIONAL, DAMAGED):
+            raise RuntimeError(f"Unrecognized character {char}")
+    n = len(row)
+    # Whether each spring could be operational; the extra entry past the end
+    # lets a group end right at the end of the row.
+    can_be_operational = [char != DAMAGED for char in row]
+    can_be_operational.append(True)
+    # Bit i is set if row[i] is (or could be) a damaged spring
+    damaged = int(row[::-1].translate(_DAMAGED_BITS), 2)
+    maybe_damaged = int(row[::-1].translate(_MAYBE_DAMAGED_BITS), 2)
+    # fits[group][pos] is whether a group of that size can start at pos.
+    # The unfolded groups repeat, so only work this out once per size.
+    fits: dict[int, list[bool]] = {}
+    for group in set(groups):
+        # Bit pos is set if row[pos:pos + group] could all be damaged...
+        starts = maybe_damaged
+        for k in range(1, group):
+            starts &= maybe_damaged >> k
+        # ... and the spring right after it could be operational
+        starts &= ~(damaged >> group)
+        fits[group] = [bit == "1" for bit in f"{starts:0{n}b}"[::-1]]
+
+    # later[pos] is how many ways the groups after this one fit in row[pos:].
+    # With no groups left, that's 1 if there are no damaged springs left.
+    # later[n + 1] is for a group that ends right at the end of the row.
+    later = [0] * (n + 2)
+    later[n] = later[n + 1] = 1
+    for pos in range(n - 1, -1, -1):
+        later[pos] = later[pos + 1] if can_be_operational[pos] else 0
+    for group in reversed(groups):
+        group_fits = fits[group]
+        ways = [0] * (n + 2)
+        for pos in range(n - 1, -1, -1):
+            count = ways[pos + 1] if can_be_operational[pos] else 0
+            if group_fits[pos]:
+                count += later[pos + group + 1]
+            ways[pos] = count
+        ways[n + 1] = ways[n]
+        later = ways
+    return later[0]
 
 
 @dataclass(frozen=True)
@@ -3,96 +3,46 @@
 from __future__ import annotations
 
 import argparse
-import functools
-
-
-@functools.cache
-def is_vert_reflection(rows: tuple[str, ...], col_idx: int) -> bool:
-    """Can you make a valid reflection at this column?"""
-    col_idx += 1
-    # Assume that all rows have the same length
-    max_len = min(len(rows[0][:col_idx]), len(rows[0][col_idx:]))
-    # print("max len is", max_len, "for column index", col_idx)
-    if max_len == 0:
-        return False
-    for row in rows:
-        left = row[:col_idx]
-        right = row[col_idx:]
-        # print("row is", row)
-        # print("split at column looks like:")
-        # print(left, "|", right)
-        left = left[::-1]  # reverse the left side
-        left = left[:max_len]
-        right = right[:max_len]
-        # print("comparing reversed left", left, "to right", right)
-        if left != right:
-            return False
-    return True
-
-
-@functools.cache
-def is_horiz_reflection(rows: tuple[str, ...], row_idx: int) -> bool:
-    """Can you make a valid reflection at this row?"""
-    top_idx = row_idx
-    bottom_idx = row_idx + 1
-    if bottom_idx == len(rows):
-        return False
-    while top_idx >= 0 and bottom_idx < len(rows):
-        # print("comparing row", top_idx, "to row", bottom_idx)
-        top_row = rows[top_idx]
-        bottom_row = rows[bottom_idx]
-        # print(top_row, "is equal to?", bottom_row)
-        if top_row != bottom_row:
-            return False
-        top_idx -= 1
-        bottom_idx += 1
-    return True
-
-
-@functools.cache
-def summarize(pattern: tuple[str, ...]) -> int:
-    """Summarize pattern (by finding horizontal and vertical reflections)."""
-    for i in range(0, len(pattern)):
-        # print()
-        # print("row", i)
-        if is_horiz_reflection(pattern, i):
-            # print(i, "is the horizontal reflection row")
-            return 100 * (i + 1)
-
-    for i in range(0, len(pattern[0])):
-        if is_vert_reflection(pattern, i):
-            return i + 1
-    return 0
 
+import numpy
+
+
+def to_grid(pattern: list[str]) -> numpy.ndarray:
+    """Turn a pattern into a grid of bools, True for each #."""
+    data = numpy.frombuffer("".join(pattern).encode(), dtype=numpy.uint8)
+    return data.reshape(len(pattern), -1) == ord("#")
 
-def flip_char(char: str) -> str:
-    """Flip one character."""
-    if char == ".":
-        return "#"
-    return "."
 
+def to_masks(grid: numpy.ndarray) -> list[int]:
+    """Turn each row of the grid into a bitmask, with a bit set for each #."""
+    # Rows get padded out to whole bytes, but the padding is the same for all
+    # of them so it never shows up in a comparison
+    return [int.from_bytes(row, "big") for row in numpy.packbits(grid, axis=1)]
 
-def flip(pattern: tuple[str, ...], row: int, col: int) -> tuple[str, ...]:
-    """Flip the character in row i and column j."""
-    new_pattern: list[str] = []
-    for row_idx, row_str in enumerate(pattern):
-        if row_idx != row:
-            new_pattern.append(row_str)
-        else:
-            row_str = row_str[:col] + flip_char(row_str[col]) + row_str[col + 1 :]
-    return tuple(e for e in new_pattern)
 
+def find_reflection(masks: list[int], target_diff: int = 0) -> int:
+    """Find a reflection between these lines, with target_diff smudges in it.
 
-@functools.cache
-def summarize_with_smudge(pattern: tuple[str, ...]) -> int:
-    """Find the smudge and summarize."""
-    for i in range(0, len(pattern)):
-        for j in range(0, len(pattern[0])):
-            smudged_pattern = flip(pattern, i, j)
-            maybe_summary = summarize(smudged_pattern)
-            if maybe_summary:
-                return maybe_summary
-    raise RuntimeError("no reflection found")
+    Returns how many lines come before the reflection, or 0 if there isn't one.
+    """
+    for i in range(1, len(masks)):
+        diff = 0
+        # Pair each line before the reflection with its mirror image after it
+        for k in range(min(i, len(masks) - i)):
+            diff += (masks[i - 1 - k] ^ masks[i + k]).bit_count()
+            if diff > target_diff:
+                break
+        if diff == target_diff:
+            return i
+    return 0
+
+
+def summarize(grid: numpy.ndarray) -> int:
+    """Summarize pattern (by finding horizontal and vertical reflections)."""
+    rows_above = find_reflection(to_masks(grid))
+    if rows_above:
+        return 100 * rows_above
+    return find_reflection(to_masks(grid.T))
 
 
 def parse_file(filename: str) -> int:
@@ -105,14 +55,10 @@ def parse_file(filename: str) -> int:
             if line:
                 pattern.append(line)
                 continue
-            print("summarizing pattern with", len(pattern), "rows")
-            total += summarize(tuple(e for e in pattern))
-            # print("new total:", total)
+            total += summarize(to_grid(pattern))
             pattern = []
     if pattern:
-        # print("last pattern")
-        to_add = summarize(tuple(e for e in pattern))
-        # print("last pattern has score", to_add)
+        to_add = summarize(to_grid(pattern))
         total += to_add
     return total
 
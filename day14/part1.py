@@ -4,56 +4,51 @@ from __future__ import annotations
 
 import argparse
 
+_ROCK_BITS = str.maketrans("O#.", "100")
+_CUBE_BITS = str.maketrans("O#.", "010")
 
-def read_input(filename: str) -> list[list[str]]:
-    """Read the input, returning a list of columns."""
-    out: list[list[str]] = []
+
+def read_input(filename: str) -> tuple[str, ...]:
+    """Read the input, returning its columns."""
     with open(filename) as f:
-        for line in f:
-            if not out:
-                # List does not exist, make it
-                for char in line:
-                    out.append([char])
-            else:
-                for i, char in enumerate(line):
-                    out[i].append(char)
-    return out
+        lines = f.read().splitlines()
+    return tuple("".join(col) for col in zip(*lines))
+
+
+def to_masks(column: str) -> tuple[int, int]:
+    """Turn a column into bitmasks of its rounded and cube rocks.
 
+    Bit i is set if there's a rock of that kind in row i.
+    """
+    column = column[::-1]
+    return (
+        int(column.translate(_ROCK_BITS), 2),
+        int(column.translate(_CUBE_BITS), 2),
+    )
 
-def score_tilted_segment(seg: list[str], largest_idx: int) -> int:
-    """Score a pre-tilted segment."""
-    count_rocks = seg.count("O")
-    return sum(i for i in range(largest_idx, largest_idx - count_rocks, -1))
 
+def score_tilted_segment(count_rocks: int, largest_idx: int) -> int:
+    """Score a segment whose rocks have all rolled up to largest_idx."""
+    # Sum of largest_idx, largest_idx - 1, ... for each rock
+    return count_rocks * largest_idx - count_rocks * (count_rocks - 1) // 2
 
-def tilt(column: list[str]) -> int:
+
+def tilt(column: str) -> int:
     """Tilt a column and return its score."""
-    cube_indexes: list[int] = []
-    for _ in range(0, column.count("#")):
-        if not cube_indexes:
-            last_index = -1
-        else:
-            last_index = cube_indexes[-1]
-        cube_indexes.append(column.index("#", last_index + 1))
-
-    if not cube_indexes:
-        return score_tilted_segment(column, len(column))
-    # Otherwise ...
+    rocks, cubes = to_masks(column)
     out = 0
-    cube_indexes.append(len(column) + 2)
-    cube_indexes = [-1] + cube_indexes
-
-    for i in range(len(cube_indexes) - 1):
-        start_idx = cube_indexes[i]
-        end_idx = cube_indexes[i + 1]
-        if start_idx == -1:
-            substr = column[0:end_idx]
-        else:
-            substr = column[start_idx:end_idx]
-        largest_idx_in_segment = len(column) - start_idx - 1
-        out += score_tilted_segment(substr, largest_idx_in_segment)
-
-    return out
+    seg_start = 0
+    while cubes:
+        lowest = cubes & -cubes
+        cube_idx = lowest.bit_length() - 1
+        # Rounded rocks between the last cube rock and this one
+        seg_mask = (1 << (cube_idx - seg_start)) - 1
+        count_rocks = ((rocks >> seg_start) & seg_mask).bit_count()
+        out += score_tilted_segment(count_rocks, len(column) - seg_start)
+        seg_start = cube_idx + 1
+        cubes ^= lowest
+    count_rocks = (rocks >> seg_start).bit_count()
+    return out + score_tilted_segment(count_rocks, len(column) - seg_start)
 
 
 def parse_file(filename: str) -> int:
@@ -62,7 +57,7 @@ def parse_file(filename: str) -> int:
     out = 0
     for col in platform:
         t = tilt(col)
-        print("col", "".join(col), "sum", t)
+        print("col", col, "sum", t)
         out += t
     return out
 
@@ -4,113 +4,128 @@ from __future__ import annotations
 
 import argparse
 
-from tqdm import tqdm
-
-
-def read_input(filename: str) -> list[list[str]]:
-    """Read the input, returning a list of columns."""
-    with open(filename) as f:
-        return [list(line.strip()) for line in f]
-
-
-def tilt_north(platform: list[list[str]]) -> list[list[str]]:
+import numpy
+
+# Cube rocks sort first so they stay put, then rounded rocks, then empty space
+_CUBE = 0
+_ROUND = 1
+_EMPTY = 2
+_TO_CODES = bytes.maketrans(b"#O.", bytes([_CUBE, _ROUND, _EMPTY]))
+
+
+def read_input(filename: str) -> numpy.ndarray:
+    """Read the input, returning a grid of codes (one row per line)."""
+    with open(filename, "rb") as f:
+        lines = f.read().split()
+    data = b"".join(lines).translate(_TO_CODES)
+    return numpy.frombuffer(data, dtype=numpy.uint8).reshape(len(lines), -1)
+
+
+def _segments(platform: numpy.ndarray, axis: int) -> numpy.ndarray:
+    """Sort key offsets for tilting towards index 0 along the axis.
+
+    Each cube rock starts a new segment. Cube rocks never move, so these can
+    be reused for every tilt in that direction.
+    """
+    return 3 * numpy.cumsum(platform == _CUBE, axis=axis, dtype=numpy.int16)
+
+
+def _tilt(
+    platform: numpy.ndarray, axis: int, segments: numpy.ndarray | None
+) -> numpy.ndarray:
+    """Tilt the platform towards index 0 along the axis."""
+    if segments is None:
+        segments = _segments(platform, axis)
+    # Sorting within a segment moves its rounded rocks up against the cube
+    # rock (or the edge) that starts it
+    # South and east tilts come in as reversed views, so this is the only copy
+    keys = segments + platform
+    keys.sort(axis=axis)
+    keys %= 3
+    return keys
+
+
+def tilt_north(
+    platform: numpy.ndarray, segments: numpy.ndarray | None = None
+) -> numpy.ndarray:
     """Tilt the platform north."""
-    for y, row in enumerate(platform):
-        for x, char in enumerate(row):
-            if char == "O":
-                platform[y][x] = "."
-                i = y - 1
-                while i >= 0 and platform[i][x] == ".":
-                    i -= 1
-                platform[i + 1][x] = "O"
-    return platform
+    return _tilt(platform, 0, segments)
 
 
-def tilt_south(platform: list[list[str]]) -> list[list[str]]:
+def tilt_south(
+    platform: numpy.ndarray, segments: numpy.ndarray | None = None
+) -> numpy.ndarray:
     """Tilt the platform south."""
-    platform.reverse()
-    platform = tilt_north(platform)
-    platform.reverse()
-    return platform
+    return _tilt(platform[::-1], 0, segments)[::-1]
 
 
-def tilt_west(platform: list[list[str]]) -> list[list[str]]:
+def tilt_west(
+    platform: numpy.ndarray, segments: numpy.ndarray | None = None
+) -> numpy.ndarray:
     """Tilt the platform west."""
-    for x in range(len(platform[0])):
-        for y in range(len(platform)):  # pylint: disable=consider-using-enumerate
-            if platform[y][x] == "O":
-                platform[y][x] = "."
-                i = x - 1
-                while i >= 0 and platform[y][i] == ".":
-                    i -= 1
-                platform[y][i + 1] = "O"
-    return platform
+    return _tilt(platform, 1, segments)
 
 
-def tilt_east(platform: list[list[str]]) -> list[list[str]]:
+def tilt_east(
+    platform: numpy.ndarray, segments: numpy.ndarray | None = None
+) -> numpy.ndarray:
     """Tilt the platform east."""
-    for i in range(len(platform)):  # pylint: disable=consider-using-enumerate
-        platform[i].reverse()
-    platform = tilt_west(platform)
-    for i in range(len(platform)):  # pylint: disable=consider-using-enumerate
-        platform[i].reverse()
-    return platform
+    return _tilt(platform[:, ::-1], 1, segments)[:, ::-1]
+
 
+def spin_segments(platform: numpy.ndarray) -> tuple[numpy.ndarray, ...]:
+    """Sort key offsets for each tilt in a spin (north, west, south, east)."""
+    return (
+        _segments(platform, 0),
+        _segments(platform, 1),
+        _segments(platform[::-1], 0),
+        _segments(platform[:, ::-1], 1),
+    )
 
-def score(platform: list[list[str]]) -> int:
+
+def score(platform: numpy.ndarray) -> int:
     """Score the platform."""
-    out = 0
-    for y, row in enumerate(platform):
-        for char in row:
-            if char == "O":
-                out += len(platform) - y
-    return out
+    rocks_per_row = numpy.count_nonzero(platform == _ROUND, axis=1)
+    return int(numpy.dot(rocks_per_row, numpy.arange(len(platform), 0, -1)))
 
 
-def make_state(platform: list[list[str]]) -> str:
-    """Turn the platform into a printable string."""
-    rows_are_strs = ["".join(row) for row in platform]
-    return "\n".join(rows_are_strs)
+def make_state(platform: numpy.ndarray) -> bytes:
+    """Turn the platform into something hashable."""
+    # Cube rocks never move, so only the rounded rocks tell states apart
+    return numpy.packbits(platform == _ROUND).tobytes()
 
 
-def spin_once(platform: list[list[str]]) -> list[list[str]]:
+def spin_once(
+    platform: numpy.ndarray, segments: tuple[numpy.ndarray, ...] | None = None
+) -> numpy.ndarray:
     """Spin the platform once."""
-    platform = tilt_north(platform)
-    platform = tilt_west(platform)
-    platform = tilt_south(platform)
-    platform = tilt_east(platform)
+    if segments is None:
+        segments = spin_segments(platform)
+    north, west, south, east = segments
+    platform = tilt_north(platform, north)
+    platform = tilt_west(platform, west)
+    platform = tilt_south(platform, south)
+    platform = tilt_east(platform, east)
     return platform
 
 
-def spin(platform: list[list[str]], n: int = 1000000000) -> int:
+def spin(platform: numpy.ndarray, n: int = 1000000000) -> int:
     """Spin the platform (tilt north, west, south, east) N times, then score."""
-
-    spin_count: int = 0
-    cycles_in: int = 0  # How long does it take for the platform to cycle?
-    reaches_state_in: dict[str, int] = {}  # Reaches state `key` in `val` cycles
-
-    with tqdm(total=n) as pbar:
-        while spin_count < n:
-            if not cycles_in:
-                state = make_state(platform)
-                if state in reaches_state_in:
-                    cycles_in = spin_count - reaches_state_in[state]
-                    steps_before_cycle = reaches_state_in[state]
-                    n_minus_steps = n - steps_before_cycle
-                    # Largest multiple of "number of steps it takes to cycle"
-                    # that is strictly less than n_minus_steps
-                    largest_mult = (n_minus_steps - 1) - (
-                        (n_minus_steps - 1) % cycles_in
-                    )
-                    # Add back the number of "bonus" steps it takes to start cycling
-                    new_spin_count = largest_mult + steps_before_cycle
-                    pbar.update(new_spin_count - spin_count)
-                    spin_count = new_spin_count
-                else:
-                    reaches_state_in[state] = spin_count
-            platform = spin_once(platform)
-            spin_count += 1
-            pbar.update(1)
+    reaches_state_in: dict[bytes, int] = {}  # Reaches state `key` in `val` cycles
+    scores: list[int] = []  # Score after `i` cycles
+    segments = spin_segments(platform)
+
+    for spin_count in range(n):
+        state = make_state(platform)
+        if state in reaches_state_in:
+            # Every state from here on repeats with this period, so the one
+            # after n spins has already been seen
+            steps_before_cycle = reaches_state_in[state]
+            cycles_in = spin_count - steps_before_cycle
+            return scores[steps_before_cycle + (n - steps_before_cycle) % cycles_in]
+        reaches_state_in[state] = spin_count
+        scores.append(score(platform))
+        platform = spin_once(platform, segments)
 
     return score(platform)
 
@@ -3,24 +3,29 @@
 from __future__ import annotations
 
 import argparse
-import functools
 
-
-@functools.cache
-def hash_char(c: str, start_at: int = 0) -> int:
-    """Hash the next/first character in a string."""
-    h = start_at + ord(c)
-    h *= 17
-    h = h % 256
-    return h
-
-
-def hash_str(s: str) -> int:
-    """Hash a string."""
-    h = 0
-    for char in s:
-        h = hash_char(char, h)
-    return h
+import numpy
+
+
+def hash_steps(line: str) -> numpy.ndarray:
+    """Hash each comma-separated step in a line, all at once."""
+    # Expanding the hash loop, each character c adds c * 17**e, where e counts
+    # back from the end of the step (1 for its last character). Mod 256,
+    # 17**e = (1 + 16)**e is 1 + 16 * e, since every later term is 0.
+    data = numpy.frombuffer(line.encode(), dtype=numpy.uint8)
+    commas = numpy.flatnonzero(data == ord(","))
+    starts: numpy.ndarray = numpy.append(numpy.array([0], dtype=numpy.intp), commas + 1)
+    ends: numpy.ndarray = numpy.append(
+        commas, numpy.array([len(data)], dtype=numpy.intp)
+    )
+    step_ends = numpy.repeat(ends, ends - starts + 1)[: len(data)]
+    weights = 1 + 16 * (step_ends - numpy.arange(len(data)))
+    weights[commas] = 0
+    hashes = numpy.zeros(len(starts), dtype=numpy.int64)
+    # An empty step hashes to 0, and reduceat can't take a start past the end
+    nonempty = starts < ends
+    hashes[nonempty] = numpy.add.reduceat(data * weights, starts[nonempty])
+    return hashes % 256
 
 
 def parse_file(filename: str) -> int:
@@ -28,8 +33,7 @@ def parse_file(filename: str) -> int:
     with open(filename) as f:
         for line in f:
             line = line.strip()
-            strs = line.split(",")
-            return sum(hash_str(s) for s in strs)
+            return int(hash_steps(line).sum())
     raise RuntimeError("how did you even get here")
 
 
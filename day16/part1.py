@@ -4,167 +4,195 @@ from __future__ import annotations
 
 import argparse
 from dataclasses import dataclass, field
-from enum import Enum
 
+import numpy
 
-class Dir(Enum):
-    """Direction (R/L/U/D)."""
+# Directions a beam can travel in
+RIGHT = 0
+DOWN = 1
+LEFT = 2
+UP = 3
 
-    RIGHT = 0
-    DOWN = 1
-    LEFT = 2
-    UP = 3
 
-
-def go(row: int, col: int, in_dir: Dir) -> tuple[int, int]:
+def go(row: int, col: int, in_dir: int) -> tuple[int, int]:
     """Coordinates that are one step in `in_dir` from the given row/col index pair."""
-    if in_dir == Dir.RIGHT:
+    if in_dir == RIGHT:
         return (row, col + 1)
-    if in_dir == Dir.LEFT:
+    if in_dir == LEFT:
         return (row, col - 1)
-    if in_dir == Dir.UP:
+    if in_dir == UP:
         return (row - 1, col)
-    if in_dir == Dir.DOWN:
+    if in_dir == DOWN:
         return (row + 1, col)
     raise ValueError(f"Unrecognized direction {in_dir}")
 
 
-class CellType(Enum):
-    """Type of cell: empty or mirrors."""
-
-    EMPTY = "."
-    MIRROR_TILT_RIGHT = "/"
-    MIRROR_TILT_LEFT = "\\"
-    SPLITTER_VERT = "|"
-    SPLITTER_HORIZ = "-"
-
-
-def _mirror_tilt_right(travel_dir: Dir) -> Dir:
-    """Beam enters a / mirror traveling in a direction. How does it bounce?"""
-    if travel_dir == Dir.RIGHT:
-        return Dir.UP
-    if travel_dir == Dir.DOWN:
-        return Dir.LEFT
-    if travel_dir == Dir.LEFT:
-        return Dir.DOWN
-    if travel_dir == Dir.UP:
-        return Dir.RIGHT
-    raise ValueError(f"Unrecognized direction {travel_dir}")
-
-
-def _mirror_tilt_left(travel_dir: Dir) -> Dir:
-    """Beam enters a \\ mirror traveling in a direction. How does it bounce?"""
-    if travel_dir == Dir.RIGHT:
-        return Dir.DOWN
-    if travel_dir == Dir.DOWN:
-        return Dir.RIGHT
-    if travel_dir == Dir.LEFT:
-        return Dir.UP
-    if travel_dir == Dir.UP:
-        return Dir.LEFT
-    raise ValueError(f"Unrecognized direction {travel_dir}")
-
-
-@dataclass
-class Cell:
-    """One cell on the floor."""
-
-    contents: CellType
-    energized_from: dict[Dir, bool] = field(
-        default_factory=lambda: {d: False for d in list(Dir)}
-    )
-
-    @property
-    def energized(self) -> bool:
-        """Is this cell energized?"""
-        return any(en for en in self.energized_from.values())
-
-    def beam(  # pylint: disable=too-many-return-statements
-        self, travel_dir: Dir
-    ) -> list[Dir]:  # pylint: disable=too-many-return-statements
-        """Beam travels in - where does it go?"""
-        if self.energized_from[travel_dir]:
-            return []
-        self.energized_from[travel_dir] = True
-
-        if self.contents == CellType.EMPTY:
-            return [travel_dir]
-
-        if self.contents == CellType.MIRROR_TILT_RIGHT:
-            return [_mirror_tilt_right(travel_dir)]
-
-        if self.contents == CellType.MIRROR_TILT_LEFT:
-            return [_mirror_tilt_left(travel_dir)]
-
-        if self.contents == CellType.SPLITTER_VERT:
-            if travel_dir in (Dir.UP, Dir.DOWN):
-                return [travel_dir]
-            return [Dir.UP, Dir.DOWN]
-
-        if self.contents == CellType.SPLITTER_HORIZ:
-            if travel_dir in (Dir.LEFT, Dir.RIGHT):
-                return [travel_dir]
-            return [Dir.LEFT, Dir.RIGHT]
-
-        raise ValueError(f"Unrecognized travel dir {travel_dir}")
-
-
-@dataclass(frozen=True)
-class Beam:
-    """A beam. pew pew."""
-
-    row: int
-    col: int
-    going: Dir
+# Types of cell: empty or mirrors
+EMPTY = 0
+MIRROR_TILT_RIGHT = 1
+MIRROR_TILT_LEFT = 2
+SPLITTER_VERT = 3
+SPLITTER_HORIZ = 4
+_CELL_TYPES = bytes.maketrans(b"./\\|-", bytes(range(5)))
+
+# Empty cells that a beam has passed through get this instead of direction bits
+_PASSED = 1 << 4
+
+# A straight run of empty cells that a beam lights up after entering a cell:
+# (the mirror or splitter it stops at, or -1 if it leaves the floor first,
+# then the start, stop and step of the slice of cells it passes through, and
+# bytes to fill that slice with)
+_Run = tuple[int, int, int, int, bytes]
+
+
+# _NEXT_DIRS[cell type][travel dir] is where a beam goes after traveling
+# into that type of cell in that direction
+_NEXT_DIRS: tuple[tuple[tuple[int, ...], ...], ...] = (
+    # Empty: straight through
+    ((RIGHT,), (DOWN,), (LEFT,), (UP,)),
+    # / mirror
+    ((UP,), (LEFT,), (DOWN,), (RIGHT,)),
+    # \ mirror
+    ((DOWN,), (RIGHT,), (UP,), (LEFT,)),
+    # | splitter
+    ((UP, DOWN), (DOWN,), (UP, DOWN), (UP,)),
+    # - splitter
+    ((RIGHT,), (LEFT, RIGHT), (LEFT,), (LEFT, RIGHT)),
+)
 
 
 @dataclass
 class Floor:
-    """The entire floor, as a list."""
-
-    tiles: list[list[Cell]] = field(default_factory=list)
-
-    def add_row(self, row: str) -> None:
-        """Add a row."""
-        row = row.strip()
-        cell_types = [CellType(char) for char in row]
-        cell_row = [Cell(ct) for ct in cell_types]
-        self.tiles.append(cell_row)
-
-    def valid_indexes(self, row: int, col: int) -> bool:
-        """Are these valid indexes for this floor?"""
-        return all((
-            row in range(0, len(self.tiles)),
-            col in range(0, len(self.tiles[0])),
-        ))
+    """The entire floor, as a grid of cell types."""
+
+    tiles: numpy.ndarray
+    # For mirrors and splitters, bit (1 << direction) is set once a beam has
+    # entered the cell going that way. Empty cells just get _PASSED.
+    energized_from: numpy.ndarray = field(init=False)
+    # Flat copies of the above for the beam loop, since indexing a list or a
+    # bytearray is much cheaper than indexing a numpy array one cell at a time.
+    # energized_from is a view of _energized, so they always agree.
+    _cells: list[int] = field(init=False)
+    _energized: bytearray = field(init=False)
+    # _runs[d][idx] is the run for a beam entering cell idx going in direction
+    # d, and _exits[d][idx] is the run for one leaving it (None if that's off
+    # the floor). These let a beam jump from one mirror or splitter to the next.
+    _runs: list[list[_Run]] = field(init=False)
+    _exits: list[list[_Run | None]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Start with nothing energized."""
+        self._cells = self.tiles.ravel().tolist()
+        self._energized = bytearray(self.tiles.size)
+        self.energized_from = numpy.frombuffer(
+            self._energized, dtype=numpy.uint8
+        ).reshape(self.tiles.shape)
+        self._build_runs()
+
+    @classmethod
+    def from_strs(cls, lines: list[str]) -> Floor:
+        """Convert list of strings to a Floor."""
+        rows = [line.strip() for line in lines if line.strip()]
+        if len({len(row) for row in rows}) > 1:
+            raise ValueError("lines are not all the same length")
+        data = "".join(rows).encode().translate(_CELL_TYPES)
+        tiles = numpy.frombuffer(data, dtype=numpy.uint8).reshape(len(rows), -1)
+        if numpy.any(tiles > SPLITTER_HORIZ):
+            raise ValueError("Unrecognized cell type")
+        return cls(tiles)
+
+    def _build_runs(self) -> None:
+        """Work out where a beam goes from every cell, in every direction."""
+        height, width = self.tiles.shape
+        cells = self._cells
+        # Each line of cells, in the order a beam going that way crosses them
+        lines = {
+            RIGHT: [range(r * width, (r + 1) * width) for r in range(height)],
+            LEFT: [
+                range((r + 1) * width - 1, r * width - 1, -1) for r in range(height)
+            ],
+            DOWN: [range(c, height * width, width) for c in range(width)],
+            UP: [range((height - 1) * width + c, -1, -width) for c in range(width)],
+        }
+        self._runs = []
+        for d in (RIGHT, DOWN, LEFT, UP):
+            runs: list[_Run] = [(-1, 0, 0, 1, b"")] * len(cells)
+            for line in lines[d]:
+                step = line.step
+                last = line[-1]
+                stop = -1
+                # Go backwards, so the next stop is already known
+                for idx in reversed(line):
+                    if cells[idx] != EMPTY:
+                        stop = idx
+                    end = stop - step if stop != -1 else last
+                    count = (end - idx) // step + 1
+                    passed = bytes([_PASSED]) * count
+                    if not count:
+                        runs[idx] = (stop, 0, 0, 1, passed)
+                    elif step > 0:
+                        runs[idx] = (stop, idx, end + 1, step, passed)
+                    else:
+                        runs[idx] = (stop, end, idx + 1, -step, passed)
+            self._runs.append(runs)
+
+        self._exits = []
+        for d, runs in enumerate(self._runs):
+            exits: list[_Run | None] = [None] * len(cells)
+            for idx in range(len(cells)):
+                row, col = divmod(idx, width)
+                new_row, new_col = go(row, col, d)
+                if 0 <= new_row < height and 0 <= new_col < width:
+                    exits[idx] = runs[new_row * width + new_col]
+            self._exits.append(exits)
 
     def pew(self) -> None:
         """Send a beam of light to the right from the top-left tile."""
-        beam_queue = [Beam(0, 0, Dir.RIGHT)]
-
+        self._shine(0, 0, RIGHT)
+
+    def _shine(self, start_row: int, start_col: int, start_dir: int) -> None:
+        """Send a beam of light into this tile, going this way."""
+        cells = self._cells
+        energized = self._energized
+        exits = self._exits
+        next_dirs = _NEXT_DIRS
+        width = self.tiles.shape[1]
+        # Each beam is the index of the cell it's entering, and its direction
+        beam_queue: list[tuple[int, int]] = []
+
+        stop, start, end, step, fill = self._runs[start_dir][
+            start_row * width + start_col
+        ]
+        energized[start:end:step] = fill
+        if stop != -1:
+            beam_queue.append((stop, start_dir))
+
+        # Beams only ever stop at mirrors and splitters
         while beam_queue:
-            beam = beam_queue.pop()
-            new_dirs = self.tiles[beam.row][beam.col].beam(beam.going)
-            for nd in new_dirs:
-                new_row, new_col = go(beam.row, beam.col, nd)
-                if self.valid_indexes(new_row, new_col):
-                    beam_queue.append(Beam(new_row, new_col, nd))
+            idx, going = beam_queue.pop()
+            bit = 1 << going
+            if energized[idx] & bit:
+                continue
+            energized[idx] |= bit
+            for nd in next_dirs[cells[idx]][going]:
+                run = exits[nd][idx]
+                if run is None:
+                    continue
+                stop, start, end, step, fill = run
+                energized[start:end:step] = fill
+                if stop != -1:
+                    beam_queue.append((stop, nd))
 
     def count_energized(self) -> int:
         """Count how many tiles are energized."""
         self.pew()
-        row_sums = [sum(cell.energized for cell in row) for row in self.tiles]
-        return sum(row_sums)
+        return int(numpy.count_nonzero(self.energized_from))
 
 
 def parse_file(filename: str) -> int:
     """Parse file, solve problem."""
-    floor = Floor()
     with open(filename) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                floor.add_row(line)
+        floor = Floor.from_strs(f.readlines())
     return floor.count_energized()
 
 